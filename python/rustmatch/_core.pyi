@@ -0,0 +1,105 @@
+"""Type stubs for the Rust extension module."""
+
+import sys
+from array import array
+from typing import List, Optional, Sequence, Tuple, Union
+
+if sys.version_info >= (3, 12):
+    from collections.abc import Buffer
+else:
+    from typing_extensions import Buffer
+
+# Any object exposing a uint8 buffer (bytes, bytearray, memoryview,
+# array.array('B'), numpy uint8 arrays) or a sequence of ints
+PixelData = Union[bytes, bytearray, memoryview, array[int], Buffer, Sequence[int]]
+
+class MatchResult:
+    @property
+    def x(self) -> int: ...
+    @property
+    def y(self) -> int: ...
+    @property
+    def confidence(self) -> float: ...
+    def to_tuple(self) -> Tuple[int, int, float]: ...
+    def bbox(self, width: int, height: int) -> Tuple[int, int, int, int]: ...
+
+class PreparedImage:
+    @staticmethod
+    def from_file(path: str) -> "PreparedImage": ...
+    @staticmethod
+    def from_bytes(data: bytes) -> "PreparedImage": ...
+    @staticmethod
+    def from_raw(pixels: PixelData, width: int, height: int) -> "PreparedImage": ...
+    @property
+    def width(self) -> int: ...
+    @property
+    def height(self) -> int: ...
+
+def find(source: str, template: str, threshold: float = 0.8) -> Optional[MatchResult]: ...
+def find_all(
+    source: str, template: str, threshold: float = 0.8, max_count: int = 10
+) -> List[MatchResult]: ...
+def find_bytes(
+    source: bytes, template: bytes, threshold: float = 0.8
+) -> Optional[MatchResult]: ...
+def find_all_bytes(
+    source: bytes, template: bytes, threshold: float = 0.8, max_count: int = 10
+) -> List[MatchResult]: ...
+def find_raw(
+    source_pixels: PixelData,
+    source_width: int,
+    source_height: int,
+    template_pixels: PixelData,
+    template_width: int,
+    template_height: int,
+    threshold: float = 0.8,
+) -> Optional[MatchResult]: ...
+def find_all_raw(
+    source_pixels: PixelData,
+    source_width: int,
+    source_height: int,
+    template_pixels: PixelData,
+    template_width: int,
+    template_height: int,
+    threshold: float = 0.8,
+    max_count: int = 10,
+) -> List[MatchResult]: ...
+def find_many(
+    source: str, templates: List[str], threshold: float = 0.8
+) -> List[Optional[MatchResult]]: ...
+def find_all_many(
+    source: str, templates: List[str], threshold: float = 0.8, max_count: int = 10
+) -> List[List[MatchResult]]: ...
+def find_many_bytes(
+    source: bytes, templates: List[bytes], threshold: float = 0.8
+) -> List[Optional[MatchResult]]: ...
+def find_all_many_bytes(
+    source: bytes, templates: List[bytes], threshold: float = 0.8, max_count: int = 10
+) -> List[List[MatchResult]]: ...
+def find_many_raw(
+    source_pixels: PixelData,
+    source_width: int,
+    source_height: int,
+    templates: Sequence[Tuple[PixelData, int, int]],
+    threshold: float = 0.8,
+) -> List[Optional[MatchResult]]: ...
+def find_all_many_raw(
+    source_pixels: PixelData,
+    source_width: int,
+    source_height: int,
+    templates: Sequence[Tuple[PixelData, int, int]],
+    threshold: float = 0.8,
+    max_count: int = 10,
+) -> List[List[MatchResult]]: ...
+def find_prepared(
+    source: PreparedImage, template: PreparedImage, threshold: float = 0.8
+) -> Optional[MatchResult]: ...
+def find_all_prepared(
+    source: PreparedImage, template: PreparedImage, threshold: float = 0.8, max_count: int = 10
+) -> List[MatchResult]: ...
+def get_size(path: str) -> Tuple[int, int]: ...
+def get_size_bytes(data: bytes) -> Tuple[int, int]: ...
+def set_threads(num: int = 0) -> None: ...
+def clear_cache() -> None: ...
+def set_cache_size(size: int) -> None: ...
+def version() -> str: ...
@@ -7,12 +7,23 @@
 //! This library can work without numpy by using file paths or bytes directly.
 //! The image crate handles all image loading and conversion internally.
 
-use image::{DynamicImage, GrayImage, GenericImageView};
+use image::{DynamicImage, GrayImage, ImageFormat};
 use pyo3::prelude::*;
 use pyo3::exceptions::{PyValueError, PyIOError};
-use pyo3::types::PyBytes;
-use rayon::prelude::*;
-use std::io::Cursor;
+use pyo3::buffer::PyBuffer;
+use pyo3::types::{PyList, PyTuple};
+use memmap2::Mmap;
+use std::borrow::Cow;
+use std::fs::File;
+use std::cmp::{Ordering, Reverse};
+use std::collections::{BinaryHeap, VecDeque};
+use std::io::{BufRead, BufReader, Cursor, Read, Seek};
+use std::ops::Range;
+use std::path::PathBuf;
+use std::sync::{Arc, Mutex, MutexGuard, OnceLock};
+use std::time::SystemTime;
+
+mod simd;
 
 // ============================================================================
 // Data Structures
@@ -49,22 +60,94 @@ impl MatchResult {
     }
 }
 
-/// Internal grayscale image wrapper
-struct GrayImageData {
-    data: Vec<f64>,
+/// Internal grayscale image wrapper (8-bit luma, row-major)
+///
+/// Decoded images own their pixels; raw pixels passed in from Python are
+/// borrowed for the duration of the call.
+struct GrayImageData<'a> {
+    data: Cow<'a, [u8]>,
     width: usize,
     height: usize,
 }
 
-impl GrayImageData {
-    fn from_gray_image(img: &GrayImage) -> Self {
+impl<'a> GrayImageData<'a> {
+    fn from_pixels(pixels: &'a [u8], w: usize, h: usize) -> Self {
+        Self { data: Cow::Borrowed(pixels), width: w, height: h }
+    }
+
+    fn into_owned(self) -> GrayImageData<'static> {
+        GrayImageData { data: Cow::Owned(self.data.into_owned()), width: self.width, height: self.height }
+    }
+}
+
+impl GrayImageData<'static> {
+    fn from_gray_image(img: GrayImage) -> Self {
         let (w, h) = img.dimensions();
-        let data: Vec<f64> = img.as_raw().iter().map(|&v| v as f64).collect();
-        Self { data, width: w as usize, height: h as usize }
+        Self { data: Cow::Owned(img.into_raw()), width: w as usize, height: h as usize }
     }
     
-    fn from_dynamic(img: &DynamicImage) -> Self {
-        Self::from_gray_image(&img.to_luma8())
+    fn from_dynamic(img: DynamicImage) -> Self {
+        Self::from_gray_image(img.into_luma8())
+    }
+}
+
+/// Source image ready for searching: pixels plus an integral image that is
+/// built on first use and then reused (e.g. across cached `find` calls).
+struct PreparedImage<'a> {
+    image: GrayImageData<'a>,
+    integral: OnceLock<IntegralImage>,
+}
+
+impl<'a> PreparedImage<'a> {
+    fn new(image: GrayImageData<'a>) -> Self {
+        Self { image, integral: OnceLock::new() }
+    }
+
+    fn integral(&self) -> &IntegralImage {
+        self.integral.get_or_init(|| IntegralImage::new(&self.image.data, self.image.width, self.image.height))
+    }
+}
+
+/// Raw grayscale pixels passed in from Python
+///
+/// Anything exposing a contiguous `u8` buffer (bytes, bytearray, memoryview,
+/// `array.array('B')`, numpy `uint8` arrays) is borrowed in place, so no
+/// per-pixel Python ints are created. Other sequences of ints are collected.
+///
+/// Lists and tuples are recognised by type and collected straight away, so
+/// they don't pay for a failed buffer request (and its discarded
+/// `TypeError`) on every call.
+enum PixelData {
+    Buffer(PyBuffer<u8>),
+    List(Vec<u8>),
+}
+
+impl<'source> FromPyObject<'source> for PixelData {
+    fn extract(ob: &'source PyAny) -> PyResult<Self> {
+        if ob.is_instance_of::<PyList>() || ob.is_instance_of::<PyTuple>() {
+            return Ok(PixelData::List(ob.extract()?));
+        }
+        if let Ok(buf) = PyBuffer::<u8>::get(ob) {
+            if buf.is_c_contiguous() {
+                return Ok(PixelData::Buffer(buf));
+            }
+            return Ok(PixelData::List(buf.to_vec(ob.py())?));
+        }
+        Ok(PixelData::List(ob.extract()?))
+    }
+}
+
+impl PixelData {
+    fn as_slice(&self) -> &[u8] {
+        match self {
+            PixelData::Buffer(buf) if buf.len_bytes() == 0 => &[],
+            // Safety: the buffer is C-contiguous with `u8` items, and the
+            // export (held by `self`) keeps the memory alive and unresized.
+            PixelData::Buffer(buf) => unsafe {
+                std::slice::from_raw_parts(buf.buf_ptr() as *const u8, buf.len_bytes())
+            },
+            PixelData::List(v) => v,
+        }
     }
 }
 
@@ -72,49 +155,51 @@ impl GrayImageData {
 // Integral Image Implementation
 // ============================================================================
 
+/// Summed-area tables over the 8-bit source.
+///
+/// `sum` is `u32` and wraps on overflow: a region sum recovered with wrapping
+/// arithmetic is still exact as long as the region itself sums to less than
+/// 2^32, i.e. holds fewer than ~16.8M pixels.
 struct IntegralImage {
-    sum: Vec<f64>,
-    sq_sum: Vec<f64>,
+    sum: Vec<u32>,
+    sq_sum: Vec<u64>,
     width: usize,
 }
 
 impl IntegralImage {
-    fn new(data: &[f64], w: usize, h: usize) -> Self {
+    fn new(data: &[u8], w: usize, h: usize) -> Self {
         let width = w + 1;
         let size = width * (h + 1);
         
-        let mut sum = vec![0.0f64; size];
-        let mut sq_sum = vec![0.0f64; size];
+        let mut sum = vec![0u32; size];
+        let mut sq_sum = vec![0u64; size];
 
         for y in 0..h {
-            let row_offset = y * w;
-            for x in 0..w {
-                let v = data[row_offset + x];
-                let idx = (y + 1) * width + (x + 1);
-                let idx_up = y * width + (x + 1);
-                let idx_left = (y + 1) * width + x;
-                let idx_diag = y * width + x;
-                
-                sum[idx] = v + sum[idx_up] + sum[idx_left] - sum[idx_diag];
-                sq_sum[idx] = v * v + sq_sum[idx_up] + sq_sum[idx_left] - sq_sum[idx_diag];
-            }
+            let row = &data[y * w..(y + 1) * w];
+            let (sum_prev, sum_cur) = sum.split_at_mut((y + 1) * width);
+            let (sq_prev, sq_cur) = sq_sum.split_at_mut((y + 1) * width);
+            simd::integral_row(
+                row,
+                &sum_prev[y * width + 1..], &sq_prev[y * width + 1..],
+                &mut sum_cur[1..width], &mut sq_cur[1..width],
+            );
         }
         Self { sum, sq_sum, width }
     }
 
     #[inline(always)]
-    fn get_stats(&self, x: usize, y: usize, w: usize, h: usize) -> (f64, f64) {
+    fn get_stats(&self, x: usize, y: usize, w: usize, h: usize) -> (u64, u64) {
         let idx1 = y * self.width + x;
         let idx2 = y * self.width + (x + w);
         let idx3 = (y + h) * self.width + x;
         let idx4 = (y + h) * self.width + (x + w);
         
         unsafe {
-            let s = *self.sum.get_unchecked(idx4) - *self.sum.get_unchecked(idx2) 
-                  - *self.sum.get_unchecked(idx3) + *self.sum.get_unchecked(idx1);
-            let sq = *self.sq_sum.get_unchecked(idx4) - *self.sq_sum.get_unchecked(idx2) 
-                   - *self.sq_sum.get_unchecked(idx3) + *self.sq_sum.get_unchecked(idx1);
-            (s, sq)
+            let s = self.sum.get_unchecked(idx4).wrapping_sub(*self.sum.get_unchecked(idx2))
+                .wrapping_sub(*self.sum.get_unchecked(idx3)).wrapping_add(*self.sum.get_unchecked(idx1));
+            let sq = *self.sq_sum.get_unchecked(idx4) + *self.sq_sum.get_unchecked(idx1)
+                   - *self.sq_sum.get_unchecked(idx2) - *self.sq_sum.get_unchecked(idx3);
+            (s as u64, sq)
         }
     }
 }
@@ -123,23 +208,94 @@ impl IntegralImage {
 // Template Preprocessing
 // ============================================================================
 
+/// Largest template (in pixels) for which the integer NCC terms can't overflow:
+/// `n × Σ S·T` and `S_sum × T_sum` both stay below 2^62.
+const MAX_TEMPLATE_PIXELS: usize = 1 << 23;
+
+/// Template terms of the NCC that don't depend on the search position
+struct TemplateStats {
+    n: u64,
+    sum: u64,
+    /// n × Σ T² - T_sum², 0 for a flat template
+    var_n: u64,
+}
+
+impl TemplateStats {
+    /// `tile` is the padded template; the zero padding doesn't affect the sums.
+    fn new(tile: &[u8], stride: usize, w: usize, h: usize) -> Self {
+        let n = (w * h) as u64;
+        let sum = simd::sum_u8(tile);
+        let sq_sum = simd::dot_window(tile, stride, 0, tile, stride, w, h);
+        let var_n = n * sq_sum - sum * sum;
+        Self { n, sum, var_n }
+    }
+}
+
+/// Templates are correlated in this many row blocks, with a pruning check
+/// after each block but the last.
+const PRUNE_BLOCKS: usize = 4;
+
+/// Below this many pixels per block a check costs more than it can save.
+const PRUNE_MIN_BLOCK_PIXELS: usize = 128;
+
+/// Template totals over its first `rows` rows, for the pruning bound
+struct PruneStep {
+    rows: usize,
+    /// Σ T over the first `rows` rows
+    head_sum: f64,
+    /// Σ (T - T_mean)² over the remaining rows
+    tail_energy: f64,
+}
+
+impl PruneStep {
+    /// Checkpoints at the end of each row block; none for small templates or
+    /// flat ones (which always score 0).
+    fn for_template(data: &[u8], w: usize, h: usize, stats: &TemplateStats) -> Vec<Self> {
+        let block = (h + PRUNE_BLOCKS - 1) / PRUNE_BLOCKS;
+        if h < PRUNE_BLOCKS || block * w < PRUNE_MIN_BLOCK_PIXELS || stats.var_n == 0 {
+            return Vec::new();
+        }
+        let mean = stats.sum as f64 / stats.n as f64;
+        let row_sums: Vec<(f64, f64)> = data.chunks_exact(w)
+            .map(|row| row.iter().fold((0.0, 0.0), |(s, sq), &v| (s + v as f64, sq + (v as f64) * (v as f64))))
+            .collect();
+
+        (1..PRUNE_BLOCKS)
+            .map(|b| b * block)
+            .filter(|&rows| rows < h)
+            .map(|rows| {
+                let head_sum = row_sums[..rows].iter().map(|r| r.0).sum();
+                let (tail_sum, tail_sq) = row_sums[rows..].iter().fold((0.0, 0.0), |a, r| (a.0 + r.0, a.1 + r.1));
+                let tail_n = ((h - rows) * w) as f64;
+                let tail_energy = (tail_sq - 2.0 * mean * tail_sum + tail_n * mean * mean).max(0.0);
+                PruneStep { rows, head_sum, tail_energy }
+            })
+            .collect()
+    }
+}
+
+/// Template prepared once per search and shared by every position
 struct Template {
-    normalized: Vec<f64>,
+    /// Pixels with each row zero-padded to `stride` for the SIMD kernels
+    tile: Vec<u8>,
+    stride: usize,
     width: usize,
     height: usize,
-    inv_std_n: f64,
+    stats: TemplateStats,
+    prune_steps: Vec<PruneStep>,
 }
 
 impl Template {
-    fn new(data: &[f64], w: usize, h: usize) -> Self {
-        let n = (w * h) as f64;
-        let sum: f64 = data.iter().sum();
-        let sq_sum: f64 = data.iter().map(|&v| v * v).sum();
-        let mean = sum / n;
-        let var = (sq_sum / n) - mean * mean;
-        let std = var.sqrt().max(1e-10);
-        let normalized: Vec<f64> = data.iter().map(|&v| v - mean).collect();
-        Self { normalized, width: w, height: h, inv_std_n: 1.0 / (std * n) }
+    fn new(data: &[u8], w: usize, h: usize) -> Self {
+        debug_assert!(w * h <= MAX_TEMPLATE_PIXELS);
+        let stride = (w + simd::LANES - 1) / simd::LANES * simd::LANES;
+        let mut tile = vec![0u8; stride * h];
+        for ty in 0..h {
+            tile[ty * stride..ty * stride + w].copy_from_slice(&data[ty * w..(ty + 1) * w]);
+        }
+        let stats = TemplateStats::new(&tile, stride, w, h);
+        let prune_steps = PruneStep::for_template(data, w, h, &stats);
+        Self { tile, stride, width: w, height: h, stats, prune_steps }
     }
 }
 
@@ -147,76 +303,211 @@ impl Template {
 // NCC Core Computation
 // ============================================================================
 
+/// NCC at (x, y), scaled by n² so every term is an exact integer:
+///
+/// ```text
+///           n·Σ S·T - S_sum·T_sum
+/// ─────────────────────────────────────────
+/// sqrt((n·Σ S² - S_sum²) · (n·Σ T² - T_sum²))
+/// ```
+///
+/// Only the u8 dot product is computed per pixel; the rest comes from the
+/// integral image and the template, with one square root per position.
+/// Taking the root of the product (rather than dividing by each root) keeps
+/// an exact match at exactly 1.0: `sqrt(v · v) == v` in floating point.
+///
+/// Positions that provably score below `target` may stop early and return
+/// `f64::NEG_INFINITY` (pass `NEG_INFINITY` to always get the exact score).
+/// After each row block the centred correlation is bounded by
+///
+/// ```text
+/// Σ_head (S - S_mean)(T - T_mean) + sqrt(Σ_tail (S - S_mean)² · Σ_tail (T - T_mean)²)
+/// ```
+///
+/// (Cauchy–Schwarz on the rows not yet correlated), with the source terms
+/// taken from the integral image.
 #[inline(always)]
 fn compute_ncc(
-    src: &[f64], src_width: usize, integral: &IntegralImage, tpl: &Template, x: usize, y: usize,
+    src: &[u8], src_width: usize, integral: &IntegralImage, tpl: &Template, x: usize, y: usize,
+    target: f64,
 ) -> f64 {
     let tw = tpl.width;
     let th = tpl.height;
-    let n = (tw * th) as f64;
+    let stats = &tpl.stats;
+    let n = stats.n;
 
     let (s_sum, s_sq_sum) = integral.get_stats(x, y, tw, th);
-    let s_mean = s_sum / n;
-    let s_var = (s_sq_sum / n) - s_mean * s_mean;
-    
-    if s_var < 1.0 { return 0.0; }
-    let s_std = s_var.sqrt();
+    // Never negative (Cauchy–Schwarz); below n² means a variance under 1.
+    let s_var_n = n * s_sq_sum - s_sum * s_sum;
+    if s_var_n < n * n || stats.var_n == 0 { return 0.0; }
+    let norm = (s_var_n as f64 * stats.var_n as f64).sqrt();
 
-    let mut cross = 0.0f64;
-    let mut tpl_idx = 0;
-    
-    for ty in 0..th {
-        let src_row = (y + ty) * src_width + x;
-        for tx in 0..tw {
-            let sv = unsafe { *src.get_unchecked(src_row + tx) } - s_mean;
-            let tv = unsafe { *tpl.normalized.get_unchecked(tpl_idx) };
-            cross += sv * tv;
-            tpl_idx += 1;
+    let origin = y * src_width + x;
+    let mut dot = 0u64;
+    let mut done = 0;
+    if target > -1.0 && !tpl.prune_steps.is_empty() {
+        let nf = n as f64;
+        let (s_mean, t_mean) = (s_sum as f64 / nf, stats.sum as f64 / nf);
+        // Centred correlation the position must reach; the margin absorbs
+        // rounding in the bound so near-ties are never pruned.
+        let limit = (target - 1e-6) * norm / nf;
+        for step in &tpl.prune_steps {
+            dot += simd::dot_window(
+                src, src_width, origin + done * src_width,
+                &tpl.tile[done * tpl.stride..], tpl.stride, tw, step.rows - done,
+            );
+            done = step.rows;
+
+            let (head_sum, head_sq_sum) = integral.get_stats(x, y, tw, done);
+            let head_n = (tw * done) as f64;
+            let head = dot as f64 - t_mean * head_sum as f64 - s_mean * step.head_sum + head_n * s_mean * t_mean;
+            let gap = limit - head;
+            if gap > 0.0 {
+                let tail_sum = (s_sum - head_sum) as f64;
+                let tail_sq_sum = (s_sq_sum - head_sq_sum) as f64;
+                let tail_energy = tail_sq_sum - 2.0 * s_mean * tail_sum + (nf - head_n) * s_mean * s_mean;
+                if tail_energy.max(0.0) * step.tail_energy < gap * gap {
+                    return f64::NEG_INFINITY;
+                }
+            }
         }
     }
-    cross * tpl.inv_std_n / s_std
+
+    dot += simd::dot_window(
+        src, src_width, origin + done * src_width,
+        &tpl.tile[done * tpl.stride..], tpl.stride, tw, th - done,
+    );
+    let num = (n * dot) as i64 - (s_sum * stats.sum) as i64;
+    (num as f64 / norm).clamp(-1.0, 1.0)
+}
+
+// ============================================================================
+// Parallel Execution
+// ============================================================================
+
+/// The worker pool, the process that built it and the thread count it was
+/// asked for (0 = one per core)
+struct PoolState {
+    pid: u32,
+    num_threads: usize,
+    pool: Arc<rayon::ThreadPool>,
+}
+
+/// Pool used by all searches. Built when the module is imported and replaced
+/// by `set_num_threads`; searches already running keep the pool they started
+/// on, which shuts down once the last of them finishes.
+///
+/// A forked child inherits the parent's pool but none of its worker threads,
+/// so the pool is rebuilt whenever it belongs to another process.
+static POOL: Mutex<Option<PoolState>> = Mutex::new(None);
+
+fn build_pool(num_threads: usize) -> Result<rayon::ThreadPool, rayon::ThreadPoolBuildError> {
+    rayon::ThreadPoolBuilder::new()
+        .num_threads(if num_threads == 0 { num_cpus::get() } else { num_threads })
+        .build()
+}
+
+fn lock_pool() -> MutexGuard<'static, Option<PoolState>> {
+    POOL.lock().unwrap_or_else(|e| e.into_inner())
+}
+
+/// Swap in `pool`, built with `num_threads`, as the current process's pool.
+fn install_pool(state: &mut Option<PoolState>, num_threads: usize, pool: rayon::ThreadPool) -> Arc<rayon::ThreadPool> {
+    let pid = std::process::id();
+    let pool = Arc::new(pool);
+    if let Some(old) = state.replace(PoolState { pid, num_threads, pool: Arc::clone(&pool) }) {
+        // An inherited pool's workers don't exist here, so shutting it down
+        // could wait on them (or on locks they held) forever; leak it instead.
+        if old.pid != pid { std::mem::forget(old.pool); }
+    }
+    pool
+}
+
+/// Searches fail only if the worker pool can't be started.
+type SearchResult<T> = Result<T, rayon::ThreadPoolBuildError>;
+
+fn thread_pool() -> SearchResult<Arc<rayon::ThreadPool>> {
+    let mut state = lock_pool();
+    let num_threads = match &*state {
+        Some(current) if current.pid == std::process::id() => return Ok(Arc::clone(&current.pool)),
+        Some(inherited) => inherited.num_threads,
+        None => 0,
+    };
+    let pool = build_pool(num_threads)?;
+    Ok(install_pool(&mut state, num_threads, pool))
+}
+
+/// Split `0..rows` into one contiguous stripe per pool thread and run `f` on
+/// each, returning the results in stripe order.
+///
+/// One large task per thread keeps scheduling overhead negligible and lets each
+/// thread stream through its own band of the source image; a stripe of rows
+/// `y0..y1` reads source rows `y0..y1 + template_height - 1`.
+fn par_stripes<R: Send>(rows: usize, f: impl Fn(Range<usize>) -> R + Sync) -> SearchResult<Vec<R>> {
+    let pool = thread_pool()?;
+    let threads = pool.current_num_threads().clamp(1, rows.max(1));
+    let stripe = (rows + threads - 1) / threads;
+    let count = if stripe == 0 { 0 } else { (rows + stripe - 1) / stripe };
+
+    let mut results: Vec<Option<R>> = (0..count).map(|_| None).collect();
+    pool.scope(|s| {
+        for (i, slot) in results.iter_mut().enumerate() {
+            let f = &f;
+            let range = i * stripe..((i + 1) * stripe).min(rows);
+            s.spawn(move |_| *slot = Some(f(range)));
+        }
+    });
+    Ok(results.into_iter().flatten().collect())
 }
 
 // ============================================================================
 // Search Strategies
 // ============================================================================
 
-fn search_best(src: &[f64], sw: usize, sh: usize, tpl: &Template, threshold: f64) -> Option<MatchResult> {
+fn search_best(source: &PreparedImage, tpl: &Template, threshold: f64) -> SearchResult<Option<MatchResult>> {
+    let (src, sw, sh) = (&source.image.data[..], source.image.width, source.image.height);
     let tw = tpl.width;
     let th = tpl.height;
-    if tw > sw || th > sh { return None; }
+    if tw > sw || th > sh { return Ok(None); }
 
-    let integral = IntegralImage::new(src, sw, sh);
+    let integral = source.integral();
     let end_x = sw - tw;
     let end_y = sh - th;
 
-    let best = (0..=end_y)
-        .into_par_iter()
-        .map(|y| {
+    // Ties resolve to the leftmost x of the bottom-most tied row.
+    let better = |a: (usize, usize, f64), b: (usize, usize, f64)| if a.2 > b.2 { a } else { b };
+    let best = par_stripes(end_y + 1, |rows| {
+        let mut stripe_best = (0usize, 0usize, -1.0f64);
+        for y in rows {
             let mut row_best = (0usize, y, -1.0f64);
             for x in 0..=end_x {
-                let score = compute_ncc(src, sw, &integral, tpl, x, y);
+                let target = threshold.max(stripe_best.2).max(row_best.2);
+                let score = compute_ncc(src, sw, integral, tpl, x, y, target);
                 if score > row_best.2 { row_best = (x, y, score); }
             }
-            row_best
-        })
-        .reduce(|| (0, 0, -1.0f64), |a, b| if a.2 > b.2 { a } else { b });
+            stripe_best = better(stripe_best, row_best);
+        }
+        stripe_best
+    })?
+    .into_iter()
+    .fold((0, 0, -1.0f64), better);
 
     if best.2 >= threshold {
-        Some(MatchResult { x: best.0 as u32, y: best.1 as u32, confidence: best.2 })
-    } else { None }
+        Ok(Some(MatchResult { x: best.0 as u32, y: best.1 as u32, confidence: best.2 }))
+    } else { Ok(None) }
 }
 
 fn search_region(
-    src: &[f64], sw: usize, sh: usize, tpl: &Template,
+    source: &PreparedImage, tpl: &Template,
     x1: usize, y1: usize, x2: usize, y2: usize, threshold: f64,
 ) -> Option<MatchResult> {
-    let integral = IntegralImage::new(src, sw, sh);
+    let (src, sw) = (&source.image.data[..], source.image.width);
+    let integral = source.integral();
     let mut best = (0usize, 0usize, -1.0f64);
     
     for y in y1..=y2 {
         for x in x1..=x2 {
-            let score = compute_ncc(src, sw, &integral, tpl, x, y);
+            let score = compute_ncc(src, sw, integral, tpl, x, y, threshold.max(best.2));
             if score > best.2 { best = (x, y, score); }
         }
     }
@@ -226,41 +517,42 @@ fn search_region(
     } else { None }
 }
 
-fn downsample(src: &[f64], sw: usize, sh: usize, scale: usize) -> (Vec<f64>, usize, usize) {
+fn downsample(img: &GrayImageData, scale: usize) -> GrayImageData<'static> {
+    let (src, sw, sh) = (&img.data[..], img.width, img.height);
     let nw = sw / scale;
     let nh = sh / scale;
-    let mut result = vec![0.0; nw * nh];
-    let scale_sq = (scale * scale) as f64;
+    let mut result = vec![0u8; nw * nh];
+    let scale_sq = (scale * scale) as u32;
     
     for y in 0..nh {
         for x in 0..nw {
-            let mut sum = 0.0;
+            let mut sum = 0u32;
             for dy in 0..scale {
                 for dx in 0..scale {
-                    sum += src[(y * scale + dy) * sw + (x * scale + dx)];
+                    sum += src[(y * scale + dy) * sw + (x * scale + dx)] as u32;
                 }
             }
-            result[y * nw + x] = sum / scale_sq;
+            result[y * nw + x] = ((sum + scale_sq / 2) / scale_sq) as u8;
         }
     }
-    (result, nw, nh)
+    GrayImageData { data: Cow::Owned(result), width: nw, height: nh }
 }
 
-fn pyramid_match(
-    src: &[f64], sw: usize, sh: usize, tpl_data: &[f64], tw: usize, th: usize, threshold: f64,
-) -> Option<MatchResult> {
-    if tw > sw || th > sh { return None; }
+fn pyramid_match(source: &PreparedImage, template: &GrayImageData, threshold: f64) -> SearchResult<Option<MatchResult>> {
+    let (sw, sh) = (source.image.width, source.image.height);
+    let (tpl_data, tw, th) = (&template.data[..], template.width, template.height);
+    if tw > sw || th > sh { return Ok(None); }
 
     let min_tpl_size = 16usize;
     let max_scale = tw.min(th) / min_tpl_size;
     let scale = max_scale.min(8).next_power_of_two().max(1);
 
     if scale >= 4 {
-        let (small_src, ssw, ssh) = downsample(src, sw, sh, scale);
-        let (small_tpl, stw, sth) = downsample(tpl_data, tw, th, scale);
-        let small_template = Template::new(&small_tpl, stw, sth);
+        let small_src = PreparedImage::new(downsample(&source.image, scale));
+        let small_tpl = downsample(template, scale);
+        let small_template = Template::new(&small_tpl.data, small_tpl.width, small_tpl.height);
         
-        if let Some(coarse) = search_best(&small_src, ssw, ssh, &small_template, threshold * 0.5) {
+        if let Some(coarse) = search_best(&small_src, &small_template, threshold * 0.5)? {
             let margin = scale * 4;
             let cx = coarse.x as usize * scale;
             let cy = coarse.y as usize * scale;
@@ -271,308 +563,1016 @@ fn pyramid_match(
             let y2 = (cy + margin).min(sh.saturating_sub(th));
             
             let tpl = Template::new(tpl_data, tw, th);
-            return search_region(src, sw, sh, &tpl, x1, y1, x2, y2, threshold);
+            return Ok(search_region(source, &tpl, x1, y1, x2, y2, threshold));
         }
-        None
+        Ok(None)
     } else {
         let tpl = Template::new(tpl_data, tw, th);
-        search_best(src, sw, sh, &tpl, threshold)
+        search_best(source, &tpl, threshold)
+    }
+}
+
+/// Branchless stream compaction: writes the indices of all `scores >= min` to
+/// the front of `keep` and returns their count. The store is unconditional and
+/// only the cursor moves, so dense match regions cost no branch mispredictions.
+#[inline]
+fn compact_above(scores: &[f64], min: f64, keep: &mut [u32]) -> usize {
+    let mut n = 0;
+    for (i, &score) in scores.iter().enumerate() {
+        keep[n] = i as u32;
+        n += (score >= min) as usize;
+    }
+    n
+}
+
+/// Match candidates stored column-wise, so the sort and NMS passes only
+/// touch the fields they need. `MatchResult`s are built once at the end.
+#[derive(Default)]
+struct Candidates {
+    xs: Vec<u32>,
+    ys: Vec<u32>,
+    scores: Vec<f64>,
+}
+
+impl Candidates {
+    fn len(&self) -> usize {
+        self.xs.len()
+    }
+
+    #[inline(always)]
+    fn push(&mut self, x: usize, y: usize, score: f64) {
+        self.xs.push(x as u32);
+        self.ys.push(y as u32);
+        self.scores.push(score);
+    }
+
+    fn append(&mut self, other: &mut Candidates) {
+        self.xs.append(&mut other.xs);
+        self.ys.append(&mut other.ys);
+        self.scores.append(&mut other.scores);
+    }
+
+    fn into_results(self) -> Vec<MatchResult> {
+        (0..self.len())
+            .map(|i| MatchResult { x: self.xs[i], y: self.ys[i], confidence: self.scores[i] })
+            .collect()
+    }
+}
+
+/// Rank of a candidate for top-K selection: higher score first, then lower
+/// index - the order a stable descending sort by score gives.
+#[derive(PartialEq)]
+struct Ranked {
+    score: f64,
+    index: u32,
+}
+
+impl Eq for Ranked {}
+
+impl Ord for Ranked {
+    fn cmp(&self, other: &Self) -> Ordering {
+        self.score.partial_cmp(&other.score).unwrap().then_with(|| other.index.cmp(&self.index))
+    }
+}
+
+impl PartialOrd for Ranked {
+    fn partial_cmp(&self, other: &Self) -> Option<Ordering> {
+        Some(self.cmp(other))
+    }
+}
+
+/// Indices of the `m` best scores, best first. A min-heap of the best seen so
+/// far makes this O(N log m) instead of sorting all N.
+fn top_candidates(scores: &[f64], m: usize) -> Vec<u32> {
+    let mut heap = BinaryHeap::with_capacity(m.min(scores.len()) + 1);
+    for (i, &score) in scores.iter().enumerate() {
+        let rank = Reverse(Ranked { score, index: i as u32 });
+        if heap.len() < m {
+            heap.push(rank);
+        } else if heap.peek().is_some_and(|worst| rank < *worst) {
+            heap.pop();
+            heap.push(rank);
+        }
     }
+    heap.into_sorted_vec().into_iter().map(|Reverse(r)| r.index).collect()
+}
+
+/// Greedy NMS over `candidates` visited in `order` (best first): keep a
+/// candidate unless it lies within half a template of one already kept.
+fn suppress_overlaps(candidates: &Candidates, order: &[u32], tw: usize, th: usize, max_count: usize) -> Candidates {
+    let (half_w, half_h) = (tw as u32 / 2, th as u32 / 2);
+    let mut kept = Candidates::default();
+    for &i in order {
+        let i = i as usize;
+        let (x, y) = (candidates.xs[i], candidates.ys[i]);
+        let overlaps = kept.xs.iter().zip(&kept.ys)
+            .any(|(&kx, &ky)| x.abs_diff(kx) < half_w && y.abs_diff(ky) < half_h);
+        if !overlaps {
+            kept.push(x as usize, y as usize, candidates.scores[i]);
+            if kept.len() >= max_count { break; }
+        }
+    }
+    kept
 }
 
 fn match_multi(
-    src: &[f64], sw: usize, sh: usize, tpl_data: &[f64], tw: usize, th: usize,
-    threshold: f64, max_count: usize,
-) -> Vec<MatchResult> {
-    if tw > sw || th > sh { return vec![]; }
+    source: &PreparedImage, template: &GrayImageData, threshold: f64, max_count: usize,
+) -> SearchResult<Vec<MatchResult>> {
+    let (src, sw, sh) = (&source.image.data[..], source.image.width, source.image.height);
+    let (tpl_data, tw, th) = (&template.data[..], template.width, template.height);
+    if tw > sw || th > sh { return Ok(vec![]); }
 
-    let integral = IntegralImage::new(src, sw, sh);
+    let integral = source.integral();
     let tpl = Template::new(tpl_data, tw, th);
     let end_x = sw - tw;
     let end_y = sh - th;
     let step = 2usize;
     
-    let candidates: Vec<_> = (0..=end_y / step)
-        .into_par_iter()
-        .flat_map(|yi| {
+    let cols = end_x / step + 1;
+    let min_score = threshold * 0.9;
+    
+    let mut coarse = Candidates::default();
+    for mut stripe in par_stripes(end_y / step + 1, |rows| {
+        let mut stripe_candidates = Candidates::default();
+        let mut scores = vec![0.0f64; cols];
+        let mut keep = vec![0u32; cols];
+        for yi in rows {
             let y = yi * step;
-            let mut row_candidates = Vec::new();
-            for xi in 0..=end_x / step {
-                let x = xi * step;
-                let score = compute_ncc(src, sw, &integral, &tpl, x, y);
-                if score >= threshold * 0.9 { row_candidates.push((x, y, score)); }
+            for (xi, score) in scores.iter_mut().enumerate() {
+                *score = compute_ncc(src, sw, integral, &tpl, xi * step, y, min_score);
             }
-            row_candidates
-        })
-        .collect();
-
-    let mut results: Vec<MatchResult> = candidates
-        .iter()
-        .filter_map(|&(cx, cy, _)| {
-            let mut best = (cx, cy, -1.0f64);
-            for dy in 0..step {
-                for dx in 0..step {
-                    let x = (cx + dx).min(end_x);
-                    let y = (cy + dy).min(end_y);
-                    let score = compute_ncc(src, sw, &integral, &tpl, x, y);
-                    if score > best.2 { best = (x, y, score); }
-                }
+            let n = compact_above(&scores, min_score, &mut keep);
+            for &xi in &keep[..n] {
+                stripe_candidates.push(xi as usize * step, y, scores[xi as usize]);
             }
-            if best.2 >= threshold {
-                Some(MatchResult { x: best.0 as u32, y: best.1 as u32, confidence: best.2 })
-            } else { None }
-        })
-        .collect();
+        }
+        stripe_candidates
+    })? {
+        coarse.append(&mut stripe);
+    }
 
-    results.sort_by(|a, b| b.confidence.partial_cmp(&a.confidence).unwrap());
-    
-    let mut filtered = Vec::new();
-    for r in results {
-        let overlaps = filtered.iter().any(|f: &MatchResult| {
-            let dx = (r.x as i32 - f.x as i32).abs() as u32;
-            let dy = (r.y as i32 - f.y as i32).abs() as u32;
-            dx < tw as u32 / 2 && dy < th as u32 / 2
-        });
-        if !overlaps {
-            filtered.push(r);
-            if filtered.len() >= max_count { break; }
+    let mut refined = Candidates::default();
+    for (&cx, &cy) in coarse.xs.iter().zip(&coarse.ys) {
+        let (cx, cy) = (cx as usize, cy as usize);
+        let mut best = (cx, cy, -1.0f64);
+        for dy in 0..step {
+            for dx in 0..step {
+                let x = (cx + dx).min(end_x);
+                let y = (cy + dy).min(end_y);
+                let score = compute_ncc(src, sw, integral, &tpl, x, y, threshold.max(best.2));
+                if score > best.2 { best = (x, y, score); }
+            }
+        }
+        if best.2 >= threshold {
+            refined.push(best.0, best.1, best.2);
+        }
+    }
+
+    // Greedy NMS stops once it has kept `max_count`, so only the best few
+    // candidates are ever visited. Rank a window of them, and widen it only if
+    // overlaps used it up first; the result is the same as sorting everything.
+    let mut window = max_count.saturating_mul(4).max(64);
+    loop {
+        let order = top_candidates(&refined.scores, window);
+        let kept = suppress_overlaps(&refined, &order, tw, th, max_count);
+        if kept.len() >= max_count || window >= refined.len() {
+            return Ok(kept.into_results());
         }
+        window = window.saturating_mul(4);
     }
-    filtered
 }
 
 // ============================================================================
 // Image Loading Helpers
 // ============================================================================
 
-fn load_image_from_path(path: &str) -> PyResult<GrayImageData> {
-    let img = image::open(path)
-        .map_err(|e| PyIOError::new_err(format!("Failed to load image '{}': {}", path, e)))?;
-    Ok(GrayImageData::from_dynamic(&img))
+const PNG_SIGNATURE: [u8; 8] = [0x89, b'P', b'N', b'G', 0x0D, 0x0A, 0x1A, 0x0A];
+
+/// Largest decoded buffer the PNG fast path allocates; the same default as
+/// the `image` loader, so oversized (or forged) headers fail on both paths.
+const PNG_MAX_ALLOC: usize = 512 * 1024 * 1024;
+
+/// Decode encoded image data straight to 8-bit luma.
+///
+/// 8-bit PNGs (the common screenshot case) go through the `png` decoder into a
+/// single preallocated buffer that is converted to luma in place. Everything
+/// else uses the generic `image` loader; `hint` is the format implied by a file
+/// extension, used when the content can't be sniffed.
+fn decode_gray_fast(data: &[u8], hint: Option<ImageFormat>) -> Result<GrayImageData<'static>, String> {
+    if data.starts_with(&PNG_SIGNATURE) {
+        if let Some(img) = decode_png_gray(data).map_err(|e| e.to_string())? {
+            return Ok(img);
+        }
+    }
+
+    let mut reader = image::io::Reader::new(Cursor::new(data))
+        .with_guessed_format()
+        .map_err(|e| e.to_string())?;
+    if reader.format().is_none() {
+        if let Some(format) = hint { reader.set_format(format); }
+    }
+    let img = reader.decode().map_err(|e| e.to_string())?;
+    Ok(GrayImageData::from_dynamic(img))
+}
+
+/// PNG fast path. Returns `None` for 16-bit images so they keep the generic
+/// loader's 16 -> 8 bit conversion.
+fn decode_png_gray(data: &[u8]) -> Result<Option<GrayImageData<'static>>, png::DecodingError> {
+    let mut decoder = png::Decoder::new_with_limits(data, png::Limits { bytes: PNG_MAX_ALLOC });
+    decoder.set_transformations(png::Transformations::EXPAND);
+    let mut reader = decoder.read_info()?;
+    if reader.info().bit_depth == png::BitDepth::Sixteen {
+        return Ok(None);
+    }
+    if reader.output_buffer_size() > PNG_MAX_ALLOC {
+        return Err(png::DecodingError::LimitsExceeded);
+    }
+
+    let mut buf = vec![0u8; reader.output_buffer_size()];
+    let info = reader.next_frame(&mut buf)?;
+    let (w, h) = (info.width as usize, info.height as usize);
+    let channels = match info.color_type {
+        png::ColorType::Grayscale => 1,
+        png::ColorType::GrayscaleAlpha => 2,
+        png::ColorType::Rgb => 3,
+        png::ColorType::Rgba => 4,
+        png::ColorType::Indexed => return Ok(None),
+    };
+    luma_in_place(&mut buf, channels, w * h);
+    buf.truncate(w * h);
+    Ok(Some(GrayImageData { data: Cow::Owned(buf), width: w, height: h }))
+}
+
+/// Collapse interleaved pixels to luma at the front of `buf`.
+///
+/// Uses the same integer Rec. 709 weights as `image`'s `to_luma8`, so both
+/// decode paths agree. Writing pixel `i` never clobbers unread input, since
+/// its source starts at byte `i * channels`.
+fn luma_in_place(buf: &mut [u8], channels: usize, pixels: usize) {
+    match channels {
+        1 => {}
+        2 => {
+            for i in 0..pixels { buf[i] = buf[i * 2]; }
+        }
+        _ => simd::luma_in_place(buf, channels, pixels),
+    }
+}
+
+/// Load an image file by memory-mapping it, so the decoder reads the page
+/// cache directly instead of a user-space copy of the file.
+///
+/// Falls back to a plain read where mapping isn't supported (some network
+/// filesystems, special files).
+fn load_image_from_path(path: &str) -> PyResult<GrayImageData<'static>> {
+    let load_err = |e: String| PyIOError::new_err(format!("Failed to load image '{}': {}", path, e));
+    let hint = ImageFormat::from_path(path).ok();
+    let file = File::open(path).map_err(|e| load_err(e.to_string()))?;
+
+    // Safety: the map is read-only and dropped before returning. As with any
+    // mmap reader, another process truncating the file mid-decode is not
+    // guarded against.
+    match unsafe { Mmap::map(&file) } {
+        Ok(mmap) => decode_gray_fast(&mmap, hint),
+        Err(_) => {
+            // Read through the handle we already have, in one sized buffer.
+            let size = file.metadata().map(|m| m.len() as usize).unwrap_or(0);
+            let mut data = Vec::with_capacity(size);
+            (&file).read_to_end(&mut data).map_err(|e| load_err(e.to_string()))?;
+            decode_gray_fast(&data, hint)
+        }
+    }
+    .map_err(load_err)
+}
+
+/// Buffer size for streamed file reads. Much larger than `BufReader`'s 8 KiB
+/// default, so slow or network file systems see few, large reads.
+const READ_BUFFER_SIZE: usize = 256 * 1024;
+
+/// Image dimensions from the header alone, without decoding any pixels
+fn read_dimensions<R: BufRead + Seek>(reader: R, hint: Option<ImageFormat>) -> Result<(u32, u32), String> {
+    let mut reader = image::io::Reader::new(reader)
+        .with_guessed_format()
+        .map_err(|e| e.to_string())?;
+    if reader.format().is_none() {
+        if let Some(format) = hint { reader.set_format(format); }
+    }
+    reader.into_dimensions().map_err(|e| e.to_string())
+}
+
+fn load_image_from_bytes(data: &[u8]) -> PyResult<GrayImageData<'static>> {
+    decode_gray_fast(data, None)
+        .map_err(|e| PyValueError::new_err(format!("Failed to decode image: {}", e)))
+}
+
+fn load_image_from_pixels<'a>(pixels: &'a [u8], w: usize, h: usize, what: &str) -> PyResult<GrayImageData<'a>> {
+    if pixels.len() != w * h {
+        return Err(PyValueError::new_err(format!("{} pixel count doesn't match dimensions", what)));
+    }
+    Ok(GrayImageData::from_pixels(pixels, w, h))
+}
+
+fn pool_error(e: rayon::ThreadPoolBuildError) -> PyErr {
+    PyValueError::new_err(format!("Failed to start thread pool: {}", e))
+}
+
+fn check_template_size(tpl: &GrayImageData) -> PyResult<()> {
+    if tpl.width * tpl.height > MAX_TEMPLATE_PIXELS {
+        return Err(PyValueError::new_err(format!(
+            "Template is too large ({}x{}); at most {} pixels are supported",
+            tpl.width, tpl.height, MAX_TEMPLATE_PIXELS,
+        )));
+    }
+    Ok(())
+}
+
+// ============================================================================
+// Prepared Image Cache
+// ============================================================================
+
+const DEFAULT_CACHE_SIZE: usize = 8;
+
+/// A file is reused only while its path, modification time and size all match.
+type CacheKey = (PathBuf, SystemTime, u64);
+
+/// Small LRU of images loaded by path, most recently used at the back
+struct ImageCache {
+    entries: VecDeque<(CacheKey, Arc<PreparedImage<'static>>)>,
+    capacity: usize,
+}
+
+impl ImageCache {
+    fn get(&mut self, key: &CacheKey) -> Option<Arc<PreparedImage<'static>>> {
+        let pos = self.entries.iter().position(|(k, _)| k == key)?;
+        let entry = self.entries.remove(pos)?;
+        let image = Arc::clone(&entry.1);
+        self.entries.push_back(entry);
+        Some(image)
+    }
+
+    fn insert(&mut self, key: CacheKey, image: Arc<PreparedImage<'static>>) {
+        // Older versions of the same file can never be hit again
+        self.entries.retain(|(k, _)| k.0 != key.0);
+        if self.capacity == 0 { return; }
+        while self.entries.len() >= self.capacity {
+            self.entries.pop_front();
+        }
+        self.entries.push_back((key, image));
+    }
+
+    fn resize(&mut self, capacity: usize) {
+        self.capacity = capacity;
+        while self.entries.len() > capacity {
+            self.entries.pop_front();
+        }
+    }
+}
+
+static CACHE: Mutex<ImageCache> = Mutex::new(ImageCache {
+    entries: VecDeque::new(),
+    capacity: DEFAULT_CACHE_SIZE,
+});
+
+fn lock_cache() -> MutexGuard<'static, ImageCache> {
+    CACHE.lock().unwrap_or_else(|e| e.into_inner())
 }
 
-fn load_image_from_bytes(data: &[u8]) -> PyResult<GrayImageData> {
-    let img = image::load_from_memory(data)
-        .map_err(|e| PyValueError::new_err(format!("Failed to decode image: {}", e)))?;
-    Ok(GrayImageData::from_dynamic(&img))
+/// Load an image by path, reusing the decoded pixels and integral image from
+/// an earlier call when the file hasn't changed.
+fn load_prepared_from_path(path: &str) -> PyResult<Arc<PreparedImage<'static>>> {
+    // If the file can't be stat'ed, the loader below reports the error.
+    let key = std::fs::metadata(path)
+        .ok()
+        .and_then(|m| Some((PathBuf::from(path), m.modified().ok()?, m.len())));
+
+    if let Some(key) = &key {
+        if let Some(hit) = lock_cache().get(key) {
+            return Ok(hit);
+        }
+    }
+    // Decode without holding the lock; a concurrent miss just decodes twice.
+    let prepared = Arc::new(PreparedImage::new(load_image_from_path(path)?));
+    if let Some(key) = key {
+        lock_cache().insert(key, Arc::clone(&prepared));
+    }
+    Ok(prepared)
 }
 
 // ============================================================================
 // Python Interface - File Path Based (No numpy needed!)
 // ============================================================================
 
-/// Find single best match using file paths
+/// Find single best match using file paths.
+/// 
+/// This is the recommended way to use RustMatch - no numpy needed!
+/// 
+/// Both files are memory-mapped and decoded straight from the page cache,
+/// with no intermediate copy. Don't truncate or rewrite an image while a
+/// call is reading it; files that can't be mapped are read normally.
+/// 
+/// Decoded images are cached by path, modification time and size, so
+/// repeated searches against the same files skip decoding (see
+/// ``set_cache_size``).
 /// 
 /// Args:
-///     source_path: Path to source image file
-///     template_path: Path to template image file
+///     source: Path to source image file (PNG, JPEG, BMP, etc.)
+///     template: Path to template image file
 ///     threshold: Matching threshold (0.0-1.0), default 0.8
 /// 
 /// Returns:
-///     MatchResult or None
+///     MatchResult if found, None otherwise
+/// 
+/// Example:
+///     >>> result = rustmatch.find("screen.png", "button.png")
+///     >>> if result:
+///     ...     print(f"Found at ({result.x}, {result.y}), confidence: {result.confidence:.2%}")
 #[pyfunction]
-#[pyo3(signature = (source_path, template_path, threshold=0.8))]
+#[pyo3(name = "find", signature = (source, template, threshold=0.8))]
 fn find_template(
-    source_path: &str,
-    template_path: &str,
+    py: Python<'_>,
+    source: &str,
+    template: &str,
     threshold: f64,
 ) -> PyResult<Option<MatchResult>> {
-    let src = load_image_from_path(source_path)?;
-    let tpl = load_image_from_path(template_path)?;
+    py.allow_threads(|| {
+        let src = load_prepared_from_path(source)?;
+        let tpl = load_prepared_from_path(template)?;
+        check_template_size(&tpl.image)?;
     
-    Ok(pyramid_match(
-        &src.data, src.width, src.height,
-        &tpl.data, tpl.width, tpl.height,
-        threshold
-    ))
+        pyramid_match(&src, &tpl.image, threshold).map_err(pool_error)
+    })
 }
 
-/// Find all matches using file paths
+/// Find all matches using file paths.
 /// 
 /// Args:
-///     source_path: Path to source image file
-///     template_path: Path to template image file
+///     source: Path to source image file
+///     template: Path to template image file
 ///     threshold: Matching threshold (0.0-1.0), default 0.8
-///     max_count: Maximum number of matches, default 10
+///     max_count: Maximum number of matches to return, default 10
 /// 
 /// Returns:
-///     List of MatchResult objects
+///     List of MatchResult objects, sorted by confidence (descending)
+/// 
+/// Example:
+///     >>> results = rustmatch.find_all("screen.png", "star.png", max_count=5)
+///     >>> print(f"Found {len(results)} stars")
 #[pyfunction]
-#[pyo3(signature = (source_path, template_path, threshold=0.8, max_count=10))]
+#[pyo3(name = "find_all", signature = (source, template, threshold=0.8, max_count=10))]
 fn find_all_templates(
-    source_path: &str,
-    template_path: &str,
+    py: Python<'_>,
+    source: &str,
+    template: &str,
     threshold: f64,
     max_count: usize,
 ) -> PyResult<Vec<MatchResult>> {
-    let src = load_image_from_path(source_path)?;
-    let tpl = load_image_from_path(template_path)?;
+    py.allow_threads(|| {
+        let src = load_prepared_from_path(source)?;
+        let tpl = load_prepared_from_path(template)?;
+        check_template_size(&tpl.image)?;
     
-    Ok(match_multi(
-        &src.data, src.width, src.height,
-        &tpl.data, tpl.width, tpl.height,
-        threshold, max_count
-    ))
+        match_multi(&src, &tpl.image, threshold, max_count).map_err(pool_error)
+    })
 }
 
 // ============================================================================
 // Python Interface - Bytes Based (No numpy needed!)
 // ============================================================================
 
-/// Find single best match using image bytes
+/// Find single best match using image bytes.
+/// 
+/// Useful when you have image data in memory (e.g., from screenshot capture).
 /// 
 /// Args:
-///     source_bytes: Source image as bytes (PNG, JPEG, etc.)
-///     template_bytes: Template image as bytes
+///     source: Source image as bytes (PNG, JPEG, etc. encoded)
+///     template: Template image as bytes
 ///     threshold: Matching threshold (0.0-1.0), default 0.8
 /// 
 /// Returns:
-///     MatchResult or None
+///     MatchResult if found, None otherwise
+/// 
+/// Example:
+///     >>> with open("screen.png", "rb") as f:
+///     ...     source = f.read()
+///     >>> with open("button.png", "rb") as f:
+///     ...     template = f.read()
+///     >>> result = rustmatch.find_bytes(source, template)
 #[pyfunction]
-#[pyo3(signature = (source_bytes, template_bytes, threshold=0.8))]
+#[pyo3(name = "find_bytes", signature = (source, template, threshold=0.8))]
 fn find_template_bytes(
-    source_bytes: &[u8],
-    template_bytes: &[u8],
+    py: Python<'_>,
+    source: &[u8],
+    template: &[u8],
     threshold: f64,
 ) -> PyResult<Option<MatchResult>> {
-    let src = load_image_from_bytes(source_bytes)?;
-    let tpl = load_image_from_bytes(template_bytes)?;
+    py.allow_threads(|| {
+        let src = PreparedImage::new(load_image_from_bytes(source)?);
+        let tpl = load_image_from_bytes(template)?;
+        check_template_size(&tpl)?;
     
-    Ok(pyramid_match(
-        &src.data, src.width, src.height,
-        &tpl.data, tpl.width, tpl.height,
-        threshold
-    ))
+        pyramid_match(&src, &tpl, threshold).map_err(pool_error)
+    })
 }
 
-/// Find all matches using image bytes
+/// Find all matches using image bytes.
 /// 
 /// Args:
-///     source_bytes: Source image as bytes (PNG, JPEG, etc.)
-///     template_bytes: Template image as bytes
+///     source: Source image as bytes
+///     template: Template image as bytes
 ///     threshold: Matching threshold (0.0-1.0), default 0.8
 ///     max_count: Maximum number of matches, default 10
 /// 
 /// Returns:
 ///     List of MatchResult objects
 #[pyfunction]
-#[pyo3(signature = (source_bytes, template_bytes, threshold=0.8, max_count=10))]
+#[pyo3(name = "find_all_bytes", signature = (source, template, threshold=0.8, max_count=10))]
 fn find_all_templates_bytes(
-    source_bytes: &[u8],
-    template_bytes: &[u8],
+    py: Python<'_>,
+    source: &[u8],
+    template: &[u8],
     threshold: f64,
     max_count: usize,
 ) -> PyResult<Vec<MatchResult>> {
-    let src = load_image_from_bytes(source_bytes)?;
-    let tpl = load_image_from_bytes(template_bytes)?;
+    py.allow_threads(|| {
+        let src = PreparedImage::new(load_image_from_bytes(source)?);
+        let tpl = load_image_from_bytes(template)?;
+        check_template_size(&tpl)?;
     
-    Ok(match_multi(
-        &src.data, src.width, src.height,
-        &tpl.data, tpl.width, tpl.height,
-        threshold, max_count
-    ))
+        match_multi(&src, &tpl, threshold, max_count).map_err(pool_error)
+    })
 }
 
 // ============================================================================
-// Python Interface - Raw Pixel Data (List of integers, no numpy!)
+// Python Interface - Raw Pixel Data (any u8 buffer or list of integers, no numpy needed!)
 // ============================================================================
 
-/// Find single best match using raw pixel data as flat list
+/// Find single match using raw grayscale pixel data.
+/// 
+/// For advanced users who want to handle image loading themselves.
+/// 
+/// Buffer objects (bytes, bytearray, memoryview, array.array('B'), numpy
+/// uint8 arrays) are read in place: the source is searched without being
+/// copied, and only the template is repacked. Lists are converted.
+/// The GIL is released while matching, so don't modify a buffer from
+/// another thread during the call.
 /// 
 /// Args:
-///     source_pixels: Source image pixels as flat list of integers (0-255)
+///     source_pixels: Grayscale pixels as a buffer or list (row-major, 0-255)
 ///     source_width: Source image width
 ///     source_height: Source image height
-///     template_pixels: Template pixels as flat list of integers (0-255)
+///     template_pixels: Template grayscale pixels
 ///     template_width: Template width
 ///     template_height: Template height
 ///     threshold: Matching threshold (0.0-1.0), default 0.8
 /// 
 /// Returns:
-///     MatchResult or None
+///     MatchResult if found, None otherwise
 #[pyfunction]
-#[pyo3(signature = (source_pixels, source_width, source_height, template_pixels, template_width, template_height, threshold=0.8))]
+#[allow(clippy::too_many_arguments)]
+#[pyo3(name = "find_raw", signature = (source_pixels, source_width, source_height, template_pixels, template_width, template_height, threshold=0.8))]
 fn find_template_raw(
-    source_pixels: Vec<u8>,
+    py: Python<'_>,
+    source_pixels: PixelData,
     source_width: usize,
     source_height: usize,
-    template_pixels: Vec<u8>,
+    template_pixels: PixelData,
     template_width: usize,
     template_height: usize,
     threshold: f64,
 ) -> PyResult<Option<MatchResult>> {
-    if source_pixels.len() != source_width * source_height {
-        return Err(PyValueError::new_err("Source pixel count doesn't match dimensions"));
-    }
-    if template_pixels.len() != template_width * template_height {
-        return Err(PyValueError::new_err("Template pixel count doesn't match dimensions"));
-    }
-    
-    let src: Vec<f64> = source_pixels.iter().map(|&v| v as f64).collect();
-    let tpl: Vec<f64> = template_pixels.iter().map(|&v| v as f64).collect();
+    let (source_pixels, template_pixels) = (source_pixels.as_slice(), template_pixels.as_slice());
+    py.allow_threads(|| {
+        let src = PreparedImage::new(load_image_from_pixels(source_pixels, source_width, source_height, "Source")?);
+        let tpl = load_image_from_pixels(template_pixels, template_width, template_height, "Template")?;
+        check_template_size(&tpl)?;
     
-    Ok(pyramid_match(&src, source_width, source_height, &tpl, template_width, template_height, threshold))
+        pyramid_match(&src, &tpl, threshold).map_err(pool_error)
+    })
 }
 
-/// Find all matches using raw pixel data as flat list
+/// Find all matches using raw grayscale pixel data.
+/// 
+/// Args:
+///     source_pixels: Grayscale pixels as a buffer or list (row-major, 0-255)
+///     source_width: Source image width
+///     source_height: Source image height
+///     template_pixels: Template grayscale pixels
+///     template_width: Template width
+///     template_height: Template height
+///     threshold: Matching threshold (0.0-1.0), default 0.8
+///     max_count: Maximum number of matches, default 10
+/// 
+/// Returns:
+///     List of MatchResult objects
 #[pyfunction]
-#[pyo3(signature = (source_pixels, source_width, source_height, template_pixels, template_width, template_height, threshold=0.8, max_count=10))]
+#[allow(clippy::too_many_arguments)]
+#[pyo3(name = "find_all_raw", signature = (source_pixels, source_width, source_height, template_pixels, template_width, template_height, threshold=0.8, max_count=10))]
 fn find_all_templates_raw(
-    source_pixels: Vec<u8>,
+    py: Python<'_>,
+    source_pixels: PixelData,
     source_width: usize,
     source_height: usize,
-    template_pixels: Vec<u8>,
+    template_pixels: PixelData,
     template_width: usize,
     template_height: usize,
     threshold: f64,
     max_count: usize,
 ) -> PyResult<Vec<MatchResult>> {
-    if source_pixels.len() != source_width * source_height {
-        return Err(PyValueError::new_err("Source pixel count doesn't match dimensions"));
+    let (source_pixels, template_pixels) = (source_pixels.as_slice(), template_pixels.as_slice());
+    py.allow_threads(|| {
+        let src = PreparedImage::new(load_image_from_pixels(source_pixels, source_width, source_height, "Source")?);
+        let tpl = load_image_from_pixels(template_pixels, template_width, template_height, "Template")?;
+        check_template_size(&tpl)?;
+    
+        match_multi(&src, &tpl, threshold, max_count).map_err(pool_error)
+    })
+}
+
+// ============================================================================
+// Python Interface - Many Templates Against One Source
+// ============================================================================
+
+/// Find the best match of each template in one source image.
+/// 
+/// The source is decoded and its integral image built once, then shared by
+/// every template - cheaper than calling ``find`` per template.
+/// 
+/// Args:
+///     source: Path to source image file
+///     templates: Paths to template image files
+///     threshold: Matching threshold (0.0-1.0), default 0.8
+/// 
+/// Returns:
+///     List with a MatchResult or None per template, in template order
+/// 
+/// Example:
+///     >>> ok, cancel = rustmatch.find_many("screen.png", ["ok.png", "cancel.png"])
+#[pyfunction]
+#[pyo3(name = "find_many", signature = (source, templates, threshold=0.8))]
+fn find_many_templates(
+    py: Python<'_>,
+    source: &str,
+    templates: Vec<String>,
+    threshold: f64,
+) -> PyResult<Vec<Option<MatchResult>>> {
+    py.allow_threads(|| {
+        let src = load_prepared_from_path(source)?;
+        templates.iter().map(|path| {
+            let tpl = load_prepared_from_path(path)?;
+            check_template_size(&tpl.image)?;
+            pyramid_match(&src, &tpl.image, threshold).map_err(pool_error)
+        }).collect()
+    })
+}
+
+/// Find all matches of each template in one source image.
+/// 
+/// Args:
+///     source: Path to source image file
+///     templates: Paths to template image files
+///     threshold: Matching threshold (0.0-1.0), default 0.8
+///     max_count: Maximum number of matches per template, default 10
+/// 
+/// Returns:
+///     List with the matches of each template, in template order
+#[pyfunction]
+#[pyo3(name = "find_all_many", signature = (source, templates, threshold=0.8, max_count=10))]
+fn find_all_many_templates(
+    py: Python<'_>,
+    source: &str,
+    templates: Vec<String>,
+    threshold: f64,
+    max_count: usize,
+) -> PyResult<Vec<Vec<MatchResult>>> {
+    py.allow_threads(|| {
+        let src = load_prepared_from_path(source)?;
+        templates.iter().map(|path| {
+            let tpl = load_prepared_from_path(path)?;
+            check_template_size(&tpl.image)?;
+            match_multi(&src, &tpl.image, threshold, max_count).map_err(pool_error)
+        }).collect()
+    })
+}
+
+/// Find the best match of each template in one source image, using image bytes.
+/// 
+/// Args:
+///     source: Source image as bytes (PNG, JPEG, etc. encoded)
+///     templates: Template images as bytes
+///     threshold: Matching threshold (0.0-1.0), default 0.8
+/// 
+/// Returns:
+///     List with a MatchResult or None per template, in template order
+#[pyfunction]
+#[pyo3(name = "find_many_bytes", signature = (source, templates, threshold=0.8))]
+fn find_many_templates_bytes(
+    py: Python<'_>,
+    source: &[u8],
+    templates: Vec<&[u8]>,
+    threshold: f64,
+) -> PyResult<Vec<Option<MatchResult>>> {
+    py.allow_threads(|| {
+        let src = PreparedImage::new(load_image_from_bytes(source)?);
+        templates.iter().map(|&data| {
+            let tpl = load_image_from_bytes(data)?;
+            check_template_size(&tpl)?;
+            pyramid_match(&src, &tpl, threshold).map_err(pool_error)
+        }).collect()
+    })
+}
+
+/// Find all matches of each template in one source image, using image bytes.
+/// 
+/// Args:
+///     source: Source image as bytes
+///     templates: Template images as bytes
+///     threshold: Matching threshold (0.0-1.0), default 0.8
+///     max_count: Maximum number of matches per template, default 10
+/// 
+/// Returns:
+///     List with the matches of each template, in template order
+#[pyfunction]
+#[pyo3(name = "find_all_many_bytes", signature = (source, templates, threshold=0.8, max_count=10))]
+fn find_all_many_templates_bytes(
+    py: Python<'_>,
+    source: &[u8],
+    templates: Vec<&[u8]>,
+    threshold: f64,
+    max_count: usize,
+) -> PyResult<Vec<Vec<MatchResult>>> {
+    py.allow_threads(|| {
+        let src = PreparedImage::new(load_image_from_bytes(source)?);
+        templates.iter().map(|&data| {
+            let tpl = load_image_from_bytes(data)?;
+            check_template_size(&tpl)?;
+            match_multi(&src, &tpl, threshold, max_count).map_err(pool_error)
+        }).collect()
+    })
+}
+
+/// Find the best match of each template in one source image, using raw
+/// grayscale pixel data.
+/// 
+/// Args:
+///     source_pixels: Grayscale pixels as a buffer or list (row-major, 0-255)
+///     source_width: Source image width
+///     source_height: Source image height
+///     templates: List of (pixels, width, height) tuples
+///     threshold: Matching threshold (0.0-1.0), default 0.8
+/// 
+/// Returns:
+///     List with a MatchResult or None per template, in template order
+#[pyfunction]
+#[pyo3(name = "find_many_raw", signature = (source_pixels, source_width, source_height, templates, threshold=0.8))]
+fn find_many_templates_raw(
+    py: Python<'_>,
+    source_pixels: PixelData,
+    source_width: usize,
+    source_height: usize,
+    templates: Vec<(PixelData, usize, usize)>,
+    threshold: f64,
+) -> PyResult<Vec<Option<MatchResult>>> {
+    let source_pixels = source_pixels.as_slice();
+    let templates: Vec<_> = templates.iter().map(|(pixels, w, h)| (pixels.as_slice(), *w, *h)).collect();
+    py.allow_threads(|| {
+        let src = PreparedImage::new(load_image_from_pixels(source_pixels, source_width, source_height, "Source")?);
+        templates.iter().map(|&(pixels, w, h)| {
+            let tpl = load_image_from_pixels(pixels, w, h, "Template")?;
+            check_template_size(&tpl)?;
+            pyramid_match(&src, &tpl, threshold).map_err(pool_error)
+        }).collect()
+    })
+}
+
+/// Find all matches of each template in one source image, using raw
+/// grayscale pixel data.
+/// 
+/// Args:
+///     source_pixels: Grayscale pixels as a buffer or list (row-major, 0-255)
+///     source_width: Source image width
+///     source_height: Source image height
+///     templates: List of (pixels, width, height) tuples
+///     threshold: Matching threshold (0.0-1.0), default 0.8
+///     max_count: Maximum number of matches per template, default 10
+/// 
+/// Returns:
+///     List with the matches of each template, in template order
+#[pyfunction]
+#[pyo3(name = "find_all_many_raw", signature = (source_pixels, source_width, source_height, templates, threshold=0.8, max_count=10))]
+fn find_all_many_templates_raw(
+    py: Python<'_>,
+    source_pixels: PixelData,
+    source_width: usize,
+    source_height: usize,
+    templates: Vec<(PixelData, usize, usize)>,
+    threshold: f64,
+    max_count: usize,
+) -> PyResult<Vec<Vec<MatchResult>>> {
+    let source_pixels = source_pixels.as_slice();
+    let templates: Vec<_> = templates.iter().map(|(pixels, w, h)| (pixels.as_slice(), *w, *h)).collect();
+    py.allow_threads(|| {
+        let src = PreparedImage::new(load_image_from_pixels(source_pixels, source_width, source_height, "Source")?);
+        templates.iter().map(|&(pixels, w, h)| {
+            let tpl = load_image_from_pixels(pixels, w, h, "Template")?;
+            check_template_size(&tpl)?;
+            match_multi(&src, &tpl, threshold, max_count).map_err(pool_error)
+        }).collect()
+    })
+}
+
+// ============================================================================
+// Python Interface - Prepared Images
+// ============================================================================
+
+/// A decoded grayscale image that can be searched repeatedly.
+/// 
+/// Decoding happens once, when the image is created, and the integral image
+/// is built on the first search that uses it as a source. Later searches
+/// only pay for matching.
+/// 
+/// Example:
+///     >>> screen = rustmatch.PreparedImage.from_file("screen.png")
+///     >>> button = rustmatch.PreparedImage.from_file("button.png")
+///     >>> result = rustmatch.find_prepared(screen, button)
+#[pyclass(name = "PreparedImage", frozen)]
+struct PreparedImageHandle {
+    inner: Arc<PreparedImage<'static>>,
+}
+
+#[pymethods]
+impl PreparedImageHandle {
+    /// Load an image file (PNG, JPEG, BMP, etc.).
+    /// 
+    /// Shares the cache used by ``find``, so loading a file that was
+    /// searched recently doesn't decode it again.
+    #[staticmethod]
+    fn from_file(py: Python<'_>, path: &str) -> PyResult<Self> {
+        py.allow_threads(|| Ok(Self { inner: load_prepared_from_path(path)? }))
     }
-    if template_pixels.len() != template_width * template_height {
-        return Err(PyValueError::new_err("Template pixel count doesn't match dimensions"));
+    
+    /// Decode an image from bytes (PNG, JPEG, etc. encoded).
+    #[staticmethod]
+    fn from_bytes(py: Python<'_>, data: &[u8]) -> PyResult<Self> {
+        py.allow_threads(|| {
+            Ok(Self { inner: Arc::new(PreparedImage::new(load_image_from_bytes(data)?)) })
+        })
     }
     
-    let src: Vec<f64> = source_pixels.iter().map(|&v| v as f64).collect();
-    let tpl: Vec<f64> = template_pixels.iter().map(|&v| v as f64).collect();
+    /// Copy raw grayscale pixels (row-major, 0-255).
+    #[staticmethod]
+    fn from_raw(py: Python<'_>, pixels: PixelData, width: usize, height: usize) -> PyResult<Self> {
+        let pixels = pixels.as_slice();
+        py.allow_threads(|| {
+            let image = load_image_from_pixels(pixels, width, height, "Image")?.into_owned();
+            Ok(Self { inner: Arc::new(PreparedImage::new(image)) })
+        })
+    }
     
-    Ok(match_multi(&src, source_width, source_height, &tpl, template_width, template_height, threshold, max_count))
+    #[getter]
+    fn width(&self) -> usize {
+        self.inner.image.width
+    }
+    
+    #[getter]
+    fn height(&self) -> usize {
+        self.inner.image.height
+    }
+    
+    fn __repr__(&self) -> String {
+        format!("PreparedImage(width={}, height={})", self.width(), self.height())
+    }
+}
+
+/// Find single best match between two prepared images.
+/// 
+/// Args:
+///     source: Image to search in
+///     template: Image to search for
+///     threshold: Matching threshold (0.0-1.0), default 0.8
+/// 
+/// Returns:
+///     MatchResult if found, None otherwise
+#[pyfunction]
+#[pyo3(name = "find_prepared", signature = (source, template, threshold=0.8))]
+fn find_template_prepared(
+    py: Python<'_>,
+    source: PyRef<'_, PreparedImageHandle>,
+    template: PyRef<'_, PreparedImageHandle>,
+    threshold: f64,
+) -> PyResult<Option<MatchResult>> {
+    let (src, tpl) = (source.inner.clone(), template.inner.clone());
+    py.allow_threads(|| {
+        check_template_size(&tpl.image)?;
+    
+        pyramid_match(&src, &tpl.image, threshold).map_err(pool_error)
+    })
+}
+
+/// Find all matches between two prepared images.
+/// 
+/// Args:
+///     source: Image to search in
+///     template: Image to search for
+///     threshold: Matching threshold (0.0-1.0), default 0.8
+///     max_count: Maximum number of matches, default 10
+/// 
+/// Returns:
+///     List of MatchResult objects, sorted by confidence (descending)
+#[pyfunction]
+#[pyo3(name = "find_all_prepared", signature = (source, template, threshold=0.8, max_count=10))]
+fn find_all_templates_prepared(
+    py: Python<'_>,
+    source: PyRef<'_, PreparedImageHandle>,
+    template: PyRef<'_, PreparedImageHandle>,
+    threshold: f64,
+    max_count: usize,
+) -> PyResult<Vec<MatchResult>> {
+    let (src, tpl) = (source.inner.clone(), template.inner.clone());
+    py.allow_threads(|| {
+        check_template_size(&tpl.image)?;
+    
+        match_multi(&src, &tpl.image, threshold, max_count).map_err(pool_error)
+    })
 }
 
 // ============================================================================
 // Utility Functions
 // ============================================================================
 
-/// Get image dimensions from file path
+/// Get image dimensions from file.
+/// 
+/// Only the image header is read; no pixels are decoded.
+/// 
+/// Args:
+///     path: Path to image file
 /// 
 /// Returns:
 ///     Tuple of (width, height)
 #[pyfunction]
-fn get_image_size(path: &str) -> PyResult<(u32, u32)> {
-    let img = image::open(path)
-        .map_err(|e| PyIOError::new_err(format!("Failed to load image: {}", e)))?;
-    Ok(img.dimensions())
+#[pyo3(name = "get_size")]
+fn get_image_size(py: Python<'_>, path: &str) -> PyResult<(u32, u32)> {
+    py.allow_threads(|| {
+        let load_err = |e: String| PyIOError::new_err(format!("Failed to load image: {}", e));
+        let file = File::open(path).map_err(|e| load_err(e.to_string()))?;
+        let reader = BufReader::with_capacity(READ_BUFFER_SIZE, file);
+        read_dimensions(reader, ImageFormat::from_path(path).ok()).map_err(load_err)
+    })
 }
 
-/// Get image dimensions from bytes
+/// Get image dimensions from bytes.
+/// 
+/// Only the header is parsed; no pixels are decoded.
+/// 
+/// Args:
+///     data: Image data as bytes
+/// 
+/// Returns:
+///     Tuple of (width, height)
 #[pyfunction]
-fn get_image_size_bytes(data: &[u8]) -> PyResult<(u32, u32)> {
-    let img = image::load_from_memory(data)
-        .map_err(|e| PyValueError::new_err(format!("Failed to decode image: {}", e)))?;
-    Ok(img.dimensions())
+#[pyo3(name = "get_size_bytes")]
+fn get_image_size_bytes(py: Python<'_>, data: &[u8]) -> PyResult<(u32, u32)> {
+    py.allow_threads(|| {
+        read_dimensions(Cursor::new(data), None)
+            .map_err(|e| PyValueError::new_err(format!("Failed to decode image: {}", e)))
+    })
 }
 
-/// Set number of threads for parallel processing
+/// Set number of threads for parallel processing.
+/// 
+/// Can be called at any time; searches already running finish on the old
+/// threads.
+/// 
+/// Args:
+///     num: Number of threads (0 = auto-detect based on CPU cores)
 #[pyfunction]
-fn set_num_threads(num_threads: usize) -> PyResult<()> {
-    rayon::ThreadPoolBuilder::new()
-        .num_threads(if num_threads == 0 { num_cpus::get() } else { num_threads })
-        .build_global()
-        .map_err(|e| PyValueError::new_err(format!("Failed to set threads: {}", e)))
+#[pyo3(name = "set_threads", signature = (num=0))]
+fn set_num_threads(num: usize) -> PyResult<()> {
+    let pool = build_pool(num)
+        .map_err(|e| PyValueError::new_err(format!("Failed to set threads: {}", e)))?;
+    install_pool(&mut lock_pool(), num, pool);
+    Ok(())
 }
 
-/// Get library version
+/// Drop all images cached by ``find`` and ``find_all``.
+/// 
+/// Only needed to free memory, or when a file is rewritten without its
+/// modification time or size changing.
+#[pyfunction]
+fn clear_cache() {
+    lock_cache().entries.clear();
+}
+
+/// Set how many decoded images ``find`` and ``find_all`` keep cached.
+/// 
+/// Each entry costs about 13 bytes per pixel. The default is 8.
+/// 
+/// Args:
+///     size: Maximum number of cached images (0 disables caching)
+#[pyfunction]
+fn set_cache_size(size: usize) {
+    lock_cache().resize(size);
+}
+
+/// Get library version.
 #[pyfunction]
 fn version() -> &'static str {
     env!("CARGO_PKG_VERSION")
@@ -584,7 +1584,15 @@ fn version() -> &'static str {
 
 #[pymodule]
 fn _core(_py: Python, m: &PyModule) -> PyResult<()> {
+    // Spawn the worker threads now rather than inside the first search. A
+    // failure here is retried on first use, which raises it as ValueError.
+    if let Ok(pool) = build_pool(0) {
+        let mut state = lock_pool();
+        if state.is_none() { install_pool(&mut state, 0, pool); }
+    }
+    
     m.add_class::<MatchResult>()?;
+    m.add_class::<PreparedImageHandle>()?;
     
     // File path based (recommended, no numpy!)
     m.add_function(wrap_pyfunction!(find_template, m)?)?;
@@ -598,10 +1606,24 @@ fn _core(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(find_template_raw, m)?)?;
     m.add_function(wrap_pyfunction!(find_all_templates_raw, m)?)?;
     
+    // Many templates against one source
+    m.add_function(wrap_pyfunction!(find_many_templates, m)?)?;
+    m.add_function(wrap_pyfunction!(find_all_many_templates, m)?)?;
+    m.add_function(wrap_pyfunction!(find_many_templates_bytes, m)?)?;
+    m.add_function(wrap_pyfunction!(find_all_many_templates_bytes, m)?)?;
+    m.add_function(wrap_pyfunction!(find_many_templates_raw, m)?)?;
+    m.add_function(wrap_pyfunction!(find_all_many_templates_raw, m)?)?;
+    
+    // Already-decoded images
+    m.add_function(wrap_pyfunction!(find_template_prepared, m)?)?;
+    m.add_function(wrap_pyfunction!(find_all_templates_prepared, m)?)?;
+    
     // Utilities
     m.add_function(wrap_pyfunction!(get_image_size, m)?)?;
     m.add_function(wrap_pyfunction!(get_image_size_bytes, m)?)?;
     m.add_function(wrap_pyfunction!(set_num_threads, m)?)?;
+    m.add_function(wrap_pyfunction!(clear_cache, m)?)?;
+    m.add_function(wrap_pyfunction!(set_cache_size, m)?)?;
     m.add_function(wrap_pyfunction!(version, m)?)?;
     
     Ok(())
@@ -0,0 +1,432 @@
+//! SIMD kernels for the NCC hot path.
+//!
+//! Every kernel has a portable scalar version; the AVX2 (x86_64) and NEON
+//! (aarch64) versions are selected at runtime and return bit-identical results.
+
+/// Template rows are zero-padded to a multiple of this many pixels so the
+/// vector loops can run past the template width without a per-row remainder.
+pub const LANES: usize = 16;
+
+/// Max 16-pixel chunks accumulated in 32-bit lanes before flushing to `u64`.
+/// Each lane gains at most 2 * 255 * 255 per chunk, so this stays below `i32::MAX`.
+const FLUSH_CHUNKS: usize = 16384;
+
+// ============================================================================
+// Dot Product: Σ source(x + i, y + j) × template(i, j)
+// ============================================================================
+
+/// Sum of products between a template-sized source window and the template.
+///
+/// `origin` is the index of the window's top-left pixel in `src` and `stride`
+/// the source row length. `tpl` holds `th` rows of `tpl_stride` pixels, where
+/// `tpl_stride` is a multiple of [`LANES`] and the padding beyond `tw` is zero.
+#[inline]
+pub fn dot_window(
+    src: &[u8], stride: usize, origin: usize,
+    tpl: &[u8], tpl_stride: usize, tw: usize, th: usize,
+) -> u64 {
+    debug_assert!(tpl_stride % LANES == 0 && tpl_stride >= tw);
+    debug_assert!(tpl.len() >= tpl_stride * th);
+    debug_assert!(th == 0 || origin + (th - 1) * stride + tw <= src.len());
+
+    #[cfg(target_arch = "x86_64")]
+    {
+        if is_x86_feature_detected!("avx2") {
+            return unsafe {
+                match tpl_stride {
+                    16 => dot_window_avx2::<16>(src, stride, origin, tpl, tpl_stride, tw, th),
+                    32 => dot_window_avx2::<32>(src, stride, origin, tpl, tpl_stride, tw, th),
+                    48 => dot_window_avx2::<48>(src, stride, origin, tpl, tpl_stride, tw, th),
+                    64 => dot_window_avx2::<64>(src, stride, origin, tpl, tpl_stride, tw, th),
+                    _ => dot_window_avx2::<0>(src, stride, origin, tpl, tpl_stride, tw, th),
+                }
+            };
+        }
+    }
+    #[cfg(target_arch = "aarch64")]
+    {
+        return unsafe {
+            match tpl_stride {
+                16 => dot_window_neon::<16>(src, stride, origin, tpl, tpl_stride, tw, th),
+                32 => dot_window_neon::<32>(src, stride, origin, tpl, tpl_stride, tw, th),
+                48 => dot_window_neon::<48>(src, stride, origin, tpl, tpl_stride, tw, th),
+                64 => dot_window_neon::<64>(src, stride, origin, tpl, tpl_stride, tw, th),
+                _ => dot_window_neon::<0>(src, stride, origin, tpl, tpl_stride, tw, th),
+            }
+        };
+    }
+    #[allow(unreachable_code)]
+    dot_window_scalar(src, stride, origin, tpl, tpl_stride, tw, th)
+}
+
+fn dot_window_scalar(
+    src: &[u8], stride: usize, origin: usize,
+    tpl: &[u8], tpl_stride: usize, tw: usize, th: usize,
+) -> u64 {
+    let mut total = 0u64;
+    for ty in 0..th {
+        let s = &src[origin + ty * stride..][..tw];
+        let t = &tpl[ty * tpl_stride..][..tw];
+        total += s.iter().zip(t).map(|(&a, &b)| (a as u32 * b as u32) as u64).sum::<u64>();
+    }
+    total
+}
+
+// The vector kernels take the template stride as a const parameter `STRIDE`
+// for templates up to 64 pixels wide (0 = only known at runtime). With it
+// fixed, each in-bounds row is a fixed run of 1-4 chunks that the compiler
+// unrolls completely, with no inner loop or flush check.
+
+/// Number of leading pixels of a window row that can be read in whole
+/// [`LANES`] chunks. Reading past `tw` is fine (the template padding is zero)
+/// as long as the load stays inside `src`.
+#[inline(always)]
+fn vector_width(src_len: usize, row_start: usize, tw: usize, tpl_stride: usize) -> usize {
+    if row_start + tpl_stride <= src_len { tpl_stride } else { tw / LANES * LANES }
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn dot_window_avx2<const STRIDE: usize>(
+    src: &[u8], stride: usize, origin: usize,
+    tpl: &[u8], tpl_stride: usize, tw: usize, th: usize,
+) -> u64 {
+    use std::arch::x86_64::*;
+
+    let tpl_stride = if STRIDE == 0 { tpl_stride } else { STRIDE };
+    let mut total = 0u64;
+    let mut acc = _mm256_setzero_si256();
+    let mut chunks = 0usize;
+
+    for ty in 0..th {
+        let row_start = origin + ty * stride;
+        let s_ptr = src.as_ptr().add(row_start);
+        let t_ptr = tpl.as_ptr().add(ty * tpl_stride);
+        let width = vector_width(src.len(), row_start, tw, tpl_stride);
+
+        if STRIDE != 0 && width == STRIDE {
+            for k in 0..STRIDE / LANES {
+                let s = _mm256_cvtepu8_epi16(_mm_loadu_si128(s_ptr.add(k * LANES) as *const __m128i));
+                let t = _mm256_cvtepu8_epi16(_mm_loadu_si128(t_ptr.add(k * LANES) as *const __m128i));
+                acc = _mm256_add_epi32(acc, _mm256_madd_epi16(s, t));
+            }
+            // Flush before the next row could overflow, keeping `chunks` below the limit.
+            chunks += STRIDE / LANES;
+            if chunks + STRIDE / LANES > FLUSH_CHUNKS {
+                total += hsum_epi32(acc);
+                acc = _mm256_setzero_si256();
+                chunks = 0;
+            }
+            continue;
+        }
+
+        let mut i = 0;
+        while i < width {
+            let block = (width - i).min((FLUSH_CHUNKS - chunks) * LANES);
+            let end = i + block;
+            while i < end {
+                let s = _mm256_cvtepu8_epi16(_mm_loadu_si128(s_ptr.add(i) as *const __m128i));
+                let t = _mm256_cvtepu8_epi16(_mm_loadu_si128(t_ptr.add(i) as *const __m128i));
+                acc = _mm256_add_epi32(acc, _mm256_madd_epi16(s, t));
+                i += LANES;
+            }
+            chunks += block / LANES;
+            if chunks == FLUSH_CHUNKS {
+                total += hsum_epi32(acc);
+                acc = _mm256_setzero_si256();
+                chunks = 0;
+            }
+        }
+        for j in width..tw {
+            total += *s_ptr.add(j) as u64 * *t_ptr.add(j) as u64;
+        }
+    }
+    total + hsum_epi32(acc)
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn hsum_epi32(v: std::arch::x86_64::__m256i) -> u64 {
+    use std::arch::x86_64::*;
+
+    // Widen to 64-bit first: eight full lanes can exceed u32 when added together.
+    let lo = _mm256_cvtepu32_epi64(_mm256_castsi256_si128(v));
+    let hi = _mm256_cvtepu32_epi64(_mm256_extracti128_si256::<1>(v));
+    let sum = _mm256_add_epi64(lo, hi);
+    let sum = _mm_add_epi64(_mm256_castsi256_si128(sum), _mm256_extracti128_si256::<1>(sum));
+    (_mm_cvtsi128_si64(sum) + _mm_extract_epi64::<1>(sum)) as u64
+}
+
+#[cfg(target_arch = "aarch64")]
+#[target_feature(enable = "neon")]
+unsafe fn dot_window_neon<const STRIDE: usize>(
+    src: &[u8], stride: usize, origin: usize,
+    tpl: &[u8], tpl_stride: usize, tw: usize, th: usize,
+) -> u64 {
+    use std::arch::aarch64::*;
+
+    let tpl_stride = if STRIDE == 0 { tpl_stride } else { STRIDE };
+    let mut total = 0u64;
+    let mut acc = vdupq_n_u32(0);
+    let mut chunks = 0usize;
+
+    for ty in 0..th {
+        let row_start = origin + ty * stride;
+        let s_ptr = src.as_ptr().add(row_start);
+        let t_ptr = tpl.as_ptr().add(ty * tpl_stride);
+        let width = vector_width(src.len(), row_start, tw, tpl_stride);
+
+        if STRIDE != 0 && width == STRIDE {
+            for k in 0..STRIDE / LANES {
+                let s = vld1q_u8(s_ptr.add(k * LANES));
+                let t = vld1q_u8(t_ptr.add(k * LANES));
+                acc = vpadalq_u16(acc, vmull_u8(vget_low_u8(s), vget_low_u8(t)));
+                acc = vpadalq_u16(acc, vmull_u8(vget_high_u8(s), vget_high_u8(t)));
+            }
+            chunks += STRIDE / LANES;
+            if chunks + STRIDE / LANES > FLUSH_CHUNKS {
+                total += vaddlvq_u32(acc);
+                acc = vdupq_n_u32(0);
+                chunks = 0;
+            }
+            continue;
+        }
+
+        let mut i = 0;
+        while i < width {
+            let block = (width - i).min((FLUSH_CHUNKS - chunks) * LANES);
+            let end = i + block;
+            while i < end {
+                let s = vld1q_u8(s_ptr.add(i));
+                let t = vld1q_u8(t_ptr.add(i));
+                acc = vpadalq_u16(acc, vmull_u8(vget_low_u8(s), vget_low_u8(t)));
+                acc = vpadalq_u16(acc, vmull_u8(vget_high_u8(s), vget_high_u8(t)));
+                i += LANES;
+            }
+            chunks += block / LANES;
+            if chunks == FLUSH_CHUNKS {
+                total += vaddlvq_u32(acc);
+                acc = vdupq_n_u32(0);
+                chunks = 0;
+            }
+        }
+        for j in width..tw {
+            total += *s_ptr.add(j) as u64 * *t_ptr.add(j) as u64;
+        }
+    }
+    total + vaddlvq_u32(acc)
+}
+
+// ============================================================================
+// Pixel Sum: Σ data[i]
+// ============================================================================
+
+/// Sum of all bytes in `data`.
+#[inline]
+pub fn sum_u8(data: &[u8]) -> u64 {
+    #[cfg(target_arch = "x86_64")]
+    {
+        if is_x86_feature_detected!("avx2") {
+            return unsafe { sum_u8_avx2(data) };
+        }
+    }
+    #[cfg(target_arch = "aarch64")]
+    {
+        return unsafe { sum_u8_neon(data) };
+    }
+    #[allow(unreachable_code)]
+    sum_u8_scalar(data)
+}
+
+fn sum_u8_scalar(data: &[u8]) -> u64 {
+    data.iter().map(|&v| v as u64).sum()
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn sum_u8_avx2(data: &[u8]) -> u64 {
+    use std::arch::x86_64::*;
+
+    // `sad_epu8` against zero sums each group of 8 bytes into a u64 lane.
+    let zero = _mm256_setzero_si256();
+    let mut acc = _mm256_setzero_si256();
+    let chunks = data.chunks_exact(32);
+    let tail = chunks.remainder();
+    for chunk in chunks {
+        let v = _mm256_loadu_si256(chunk.as_ptr() as *const __m256i);
+        acc = _mm256_add_epi64(acc, _mm256_sad_epu8(v, zero));
+    }
+    let acc = _mm_add_epi64(_mm256_castsi256_si128(acc), _mm256_extracti128_si256::<1>(acc));
+    (_mm_cvtsi128_si64(acc) + _mm_extract_epi64::<1>(acc)) as u64 + sum_u8_scalar(tail)
+}
+
+#[cfg(target_arch = "aarch64")]
+#[target_feature(enable = "neon")]
+unsafe fn sum_u8_neon(data: &[u8]) -> u64 {
+    use std::arch::aarch64::*;
+
+    let mut acc = vdupq_n_u64(0);
+    let chunks = data.chunks_exact(16);
+    let tail = chunks.remainder();
+    for chunk in chunks {
+        acc = vpadalq_u32(acc, vpaddlq_u16(vpaddlq_u8(vld1q_u8(chunk.as_ptr()))));
+    }
+    vaddvq_u64(acc) + sum_u8_scalar(tail)
+}
+
+// ============================================================================
+// RGB(A) to Luma: (2126 R + 7152 G + 722 B) / 10000
+// ============================================================================
+
+/// Replace the first `pixels` bytes of `buf`, an interleaved RGB (`channels`
+/// = 3) or RGBA (4) image, with its 8-bit luma, in place.
+#[inline]
+pub fn luma_in_place(buf: &mut [u8], channels: usize, pixels: usize) {
+    assert!((channels == 3 || channels == 4) && buf.len() >= pixels * channels);
+
+    #[cfg(target_arch = "x86_64")]
+    {
+        if is_x86_feature_detected!("avx2") {
+            return unsafe { luma_in_place_avx2(buf, channels, pixels) };
+        }
+    }
+    luma_in_place_scalar(buf, channels, 0, pixels)
+}
+
+fn luma_in_place_scalar(buf: &mut [u8], channels: usize, start: usize, pixels: usize) {
+    for i in start..pixels {
+        let p = i * channels;
+        let l = 2126 * buf[p] as u32 + 7152 * buf[p + 1] as u32 + 722 * buf[p + 2] as u32;
+        buf[i] = (l / 10000) as u8;
+    }
+}
+
+/// Eight pixels per step: the weighted sum is formed exactly in 32-bit lanes
+/// with `madd_epi16`, then divided in f32. `(l + 0.5) / 10000` is never within
+/// 5e-5 of an integer, far more than the f32 rounding error for l < 2^22, so
+/// truncating it gives exactly `l / 10000`.
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn luma_in_place_avx2(buf: &mut [u8], channels: usize, pixels: usize) {
+    use std::arch::x86_64::*;
+
+    let ptr = buf.as_mut_ptr();
+    let coeff = _mm256_setr_epi16(
+        2126, 7152, 722, 0, 2126, 7152, 722, 0,
+        2126, 7152, 722, 0, 2126, 7152, 722, 0,
+    );
+    // RGB only: spread four 3-byte pixels into 4-byte slots (alpha = 0).
+    let spread = _mm_setr_epi8(0, 1, 2, -1, 3, 4, 5, -1, 6, 7, 8, -1, 9, 10, 11, -1);
+    let half = _mm256_set1_ps(0.5);
+    let inv = _mm256_set1_ps(1.0 / 10000.0);
+
+    // Every 16-byte load has to stay inside `buf`.
+    let last_load = if channels == 3 { 12 } else { 16 };
+    let mut i = 0;
+    while i + 8 <= pixels && i * channels + last_load + 16 <= buf.len() {
+        let src = ptr.add(i * channels);
+        let (lo, hi) = if channels == 3 {
+            (
+                _mm_shuffle_epi8(_mm_loadu_si128(src as *const __m128i), spread),
+                _mm_shuffle_epi8(_mm_loadu_si128(src.add(12) as *const __m128i), spread),
+            )
+        } else {
+            (_mm_loadu_si128(src as *const __m128i), _mm_loadu_si128(src.add(16) as *const __m128i))
+        };
+
+        let a = _mm256_madd_epi16(_mm256_cvtepu8_epi16(lo), coeff);
+        let b = _mm256_madd_epi16(_mm256_cvtepu8_epi16(hi), coeff);
+        // hadd leaves pixels as [0 1 4 5 | 2 3 6 7]; restore their order.
+        let l = _mm256_permute4x64_epi64::<0xD8>(_mm256_hadd_epi32(a, b));
+        let q = _mm256_cvttps_epi32(_mm256_mul_ps(_mm256_add_ps(_mm256_cvtepi32_ps(l), half), inv));
+
+        let q = _mm256_packus_epi16(_mm256_packus_epi32(q, q), _mm256_setzero_si256());
+        let out = _mm_unpacklo_epi32(_mm256_castsi256_si128(q), _mm256_extracti128_si256::<1>(q));
+        // The 8 bytes written end before the next step's first load.
+        _mm_storel_epi64(ptr.add(i) as *mut __m128i, out);
+        i += 8;
+    }
+    luma_in_place_scalar(buf, channels, i, pixels);
+}
+
+// ============================================================================
+// Integral Image Rows
+// ============================================================================
+
+/// Build one row of the integral images.
+///
+/// Writes `sum[x] = prev_sum[x] + Σ row[..=x]` and the same for squared pixels,
+/// so `prev_*` is the integral row above. Sums wrap on overflow (see
+/// `IntegralImage`).
+#[inline]
+pub fn integral_row(row: &[u8], prev_sum: &[u32], prev_sq: &[u64], sum: &mut [u32], sq: &mut [u64]) {
+    let w = row.len();
+    assert!(prev_sum.len() >= w && prev_sq.len() >= w && sum.len() >= w && sq.len() >= w);
+
+    #[cfg(target_arch = "x86_64")]
+    {
+        if is_x86_feature_detected!("avx2") {
+            return unsafe { integral_row_avx2(row, prev_sum, prev_sq, sum, sq) };
+        }
+    }
+    integral_row_scalar(row, prev_sum, prev_sq, sum, sq, 0, 0, 0)
+}
+
+#[allow(clippy::too_many_arguments)]
+fn integral_row_scalar(
+    row: &[u8], prev_sum: &[u32], prev_sq: &[u64], sum: &mut [u32], sq: &mut [u64],
+    start: usize, mut acc: u32, mut acc_sq: u64,
+) {
+    for x in start..row.len() {
+        let v = row[x] as u32;
+        acc = acc.wrapping_add(v);
+        acc_sq += (v * v) as u64;
+        sum[x] = prev_sum[x].wrapping_add(acc);
+        sq[x] = prev_sq[x] + acc_sq;
+    }
+}
+
+/// Log-step (Hillis–Steele) scan: 8 u32 sums and 2 × 4 u64 squared sums per step.
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn integral_row_avx2(row: &[u8], prev_sum: &[u32], prev_sq: &[u64], sum: &mut [u32], sq: &mut [u64]) {
+    use std::arch::x86_64::*;
+
+    let w = row.len();
+    let mut carry = _mm256_setzero_si256();
+    let mut carry_sq = _mm256_setzero_si256();
+    let mut x = 0;
+
+    while x + 8 <= w {
+        let px = _mm_loadl_epi64(row.as_ptr().add(x) as *const __m128i);
+
+        // Plain sums: scan within each 128-bit lane, then carry lane 0's total into lane 1.
+        let mut v = _mm256_cvtepu8_epi32(px);
+        v = _mm256_add_epi32(v, _mm256_slli_si256::<4>(v));
+        v = _mm256_add_epi32(v, _mm256_slli_si256::<8>(v));
+        v = _mm256_add_epi32(v, _mm256_shuffle_epi32::<0xFF>(_mm256_permute2x128_si256::<0x08>(v, v)));
+        v = _mm256_add_epi32(v, carry);
+        carry = _mm256_permutevar8x32_epi32(v, _mm256_set1_epi32(7));
+        let up = _mm256_loadu_si256(prev_sum.as_ptr().add(x) as *const __m256i);
+        _mm256_storeu_si256(sum.as_mut_ptr().add(x) as *mut __m256i, _mm256_add_epi32(v, up));
+
+        // Squared sums: two 4-lane u64 scans over the low and high halves.
+        let lo = _mm256_cvtepu8_epi64(px);
+        let hi = _mm256_cvtepu8_epi64(_mm_srli_si128::<4>(px));
+        for (half, p) in [lo, hi].into_iter().enumerate() {
+            let mut s = _mm256_mul_epu32(p, p);
+            s = _mm256_add_epi64(s, _mm256_slli_si256::<8>(s));
+            s = _mm256_add_epi64(s, _mm256_shuffle_epi32::<0xEE>(_mm256_permute2x128_si256::<0x08>(s, s)));
+            s = _mm256_add_epi64(s, carry_sq);
+            carry_sq = _mm256_permute4x64_epi64::<0xFF>(s);
+            let off = x + half * 4;
+            let up = _mm256_loadu_si256(prev_sq.as_ptr().add(off) as *const __m256i);
+            _mm256_storeu_si256(sq.as_mut_ptr().add(off) as *mut __m256i, _mm256_add_epi64(s, up));
+        }
+        x += 8;
+    }
+
+    let acc = _mm256_extract_epi32::<0>(carry) as u32;
+    let acc_sq = _mm256_extract_epi64::<0>(carry_sq) as u64;
+    integral_row_scalar(row, prev_sum, prev_sq, sum, sq, x, acc, acc_sq);
+}
@@ -45,7 +45,7 @@ class TestBenchmarkFilePath:
 class TestBenchmarkBytes:
     """Benchmarks for bytes based matching."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def image_bytes(self):
         """Load image bytes once."""
         with open(SOURCE_IMAGE, "rb") as f:
@@ -67,3 +67,29 @@ class TestBenchmarkBytes:
         source, template = image_bytes
         results = benchmark(rustmatch.find_all_bytes, source, template, 0.8, 10)
         assert len(results) > 0
+
+
+class TestBenchmarkPrepared:
+    """Benchmarks for already-decoded images (matching only)."""
+    
+    @pytest.fixture(scope="class")
+    def prepared(self):
+        """Decode both images once."""
+        return (
+            rustmatch.PreparedImage.from_file(SOURCE_IMAGE),
+            rustmatch.PreparedImage.from_file(TEMPLATE_IMAGE),
+        )
+    
+    @pytest.mark.benchmark(group="find-prepared")
+    def test_find_prepared(self, benchmark, prepared):
+        """Benchmark matching alone (excludes I/O and decoding)."""
+        source, template = prepared
+        result = benchmark(rustmatch.find_prepared, source, template, 0.8)
+        assert result is not None
+    
+    @pytest.mark.benchmark(group="find-all-prepared")
+    def test_find_all_prepared(self, benchmark, prepared):
+        """Benchmark multi-match alone."""
+        source, template = prepared
+        results = benchmark(rustmatch.find_all_prepared, source, template, 0.8, 10)
+        assert len(results) > 0
@@ -4,7 +4,11 @@ Zero dependencies - no numpy required!
 """
 
 import pytest
+import multiprocessing
 import os
+import random
+import struct
+import zlib
 
 # Import will fail until the library is built
 try:
@@ -27,6 +31,53 @@ SOURCE_IMAGE = os.path.join(IMAGES_DIR, "A.png")
 TEMPLATE_IMAGE = os.path.join(IMAGES_DIR, "a3.png")
 
 
+def _png_chunk(kind, body):
+    """Encode one PNG chunk with its length and CRC."""
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+
+def _encode_png(pixels, width, height, channels):
+    """Encode interleaved 8-bit RGB (3) or RGBA (4) pixels as an unfiltered PNG."""
+    color_type = {3: 2, 4: 6}[channels]
+    stride = width * channels
+    rows = b"".join(b"\x00" + pixels[y * stride:(y + 1) * stride] for y in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+        + _png_chunk(b"IDAT", zlib.compress(rows))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+def _luma(pixels, channels):
+    """Rec. 709 luma with the integer weights used by the image loader."""
+    return bytes(
+        (2126 * pixels[i] + 7152 * pixels[i + 1] + 722 * pixels[i + 2]) // 10000
+        for i in range(0, len(pixels), channels)
+    )
+
+
+# Raw fixture: a 40x30 pseudo-random image and the 8x8 crop at RAW_MATCH,
+# which occurs nowhere else in the image
+RAW_WIDTH, RAW_HEIGHT = 40, 30
+RAW_MATCH = (5, 10)
+
+
+def _raw_fixture():
+    """Return (source pixels, 8x8 template pixels) as bytes."""
+    rng = random.Random(2024)
+    source = bytes(rng.randrange(256) for _ in range(RAW_WIDTH * RAW_HEIGHT))
+    x0, y0 = RAW_MATCH
+    template = b"".join(source[(y0 + y) * RAW_WIDTH + x0:(y0 + y) * RAW_WIDTH + x0 + 8] for y in range(8))
+    return source, template
+
+
+def _find_in_child(results):
+    """Run a search in a child process and send back the result."""
+    result = rustmatch.find(SOURCE_IMAGE, TEMPLATE_IMAGE)
+    results.put(result.to_tuple() if result else None)
+
+
 class TestMatchResult:
     """Tests for MatchResult class."""
     
@@ -93,6 +144,13 @@ class TestFind:
         assert result is not None
         assert result.confidence >= 0.99
     
+    def test_find_keyword_arguments(self):
+        """Test that the documented parameter names are accepted."""
+        positional = rustmatch.find(SOURCE_IMAGE, TEMPLATE_IMAGE, 0.8)
+        keyword = rustmatch.find(source=SOURCE_IMAGE, template=TEMPLATE_IMAGE, threshold=0.8)
+        
+        assert positional.to_tuple() == keyword.to_tuple()
+    
     def test_find_nonexistent_file(self):
         """Test error handling for nonexistent file."""
         with pytest.raises(OSError):
@@ -162,6 +220,68 @@ class TestFindBytes:
         """Test error handling for invalid image data."""
         with pytest.raises(ValueError):
             rustmatch.find_bytes(b"not an image", b"also not an image")
+    
+    def test_find_bytes_oversized_header(self):
+        """Test that a forged huge PNG header is rejected, not allocated."""
+        # 65536 x 65536 RGBA claims 16 GiB of pixels
+        header = struct.pack(">IIBBBBB", 1 << 16, 1 << 16, 8, 6, 0, 0, 0)
+        data = (
+            b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(b"\x00" * 64))
+            + _png_chunk(b"IEND", b"")
+        )
+        with open(TEMPLATE_IMAGE, "rb") as f:
+            template = f.read()
+        
+        with pytest.raises(ValueError):
+            rustmatch.find_bytes(data, template)
+    
+    @pytest.mark.parametrize("channels", [3, 4])
+    def test_find_bytes_color_png_matches_luma(self, channels):
+        """Test that colour PNGs are converted with the integer Rec. 709 weights."""
+        rng = random.Random(1234)
+        # 37x21 and 11x9 pixels: neither is a whole number of 8-pixel steps
+        width, height, tw, th = 37, 21, 11, 9
+        source = bytes(rng.randrange(256) for _ in range(width * height * channels))
+        stride, row = width * channels, tw * channels
+        template = bytes(
+            min(255, v + rng.randrange(4))
+            for y in range(th)
+            for v in source[(7 + y) * stride + 13 * channels:(7 + y) * stride + 13 * channels + row]
+        )
+        
+        expected = rustmatch.find_raw(
+            _luma(source, channels), width, height, _luma(template, channels), tw, th, threshold=0.5
+        )
+        result = rustmatch.find_bytes(
+            _encode_png(source, width, height, channels),
+            _encode_png(template, tw, th, channels),
+            threshold=0.5,
+        )
+        
+        assert expected is not None
+        assert (expected.x, expected.y) == (13, 7)
+        assert result is not None
+        assert result.to_tuple() == expected.to_tuple()
+    
+    def test_find_bytes_from_threads(self):
+        """Test concurrent calls from several Python threads."""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with open(SOURCE_IMAGE, "rb") as f:
+            source_bytes = f.read()
+        with open(TEMPLATE_IMAGE, "rb") as f:
+            template_bytes = f.read()
+        expected = rustmatch.find_bytes(source_bytes, template_bytes).to_tuple()
+        
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(
+                lambda _: rustmatch.find_bytes(source_bytes, template_bytes).to_tuple(),
+                range(8),
+            ))
+        
+        assert results == [expected] * 8
 
 
 class TestFindRaw:
@@ -189,6 +309,41 @@ class TestFindRaw:
         # May or may not find match depending on variance
         assert result is None or isinstance(result, MatchResult)
     
+    def test_find_raw_buffer_types(self):
+        """Test that buffer objects match the list-based result."""
+        import array
+        
+        width, height = RAW_WIDTH, RAW_HEIGHT
+        source_pixels, template_pixels = (list(p) for p in _raw_fixture())
+        expected = rustmatch.find_raw(source_pixels, width, height, template_pixels, 8, 8, threshold=0.5)
+        
+        assert expected is not None
+        assert (expected.x, expected.y) == RAW_MATCH
+        for convert in (bytes, bytearray, tuple, lambda p: memoryview(bytes(p)), lambda p: array.array("B", p)):
+            result = rustmatch.find_raw(
+                convert(source_pixels), width, height,
+                convert(template_pixels), 8, 8,
+                threshold=0.5
+            )
+            assert result is not None
+            assert result.to_tuple() == expected.to_tuple()
+    
+    def test_find_raw_exact_match_threshold_one(self):
+        """Test that an exact match scores exactly 1.0."""
+        width, height = RAW_WIDTH, RAW_HEIGHT
+        pixels, crop = _raw_fixture()
+        
+        result = rustmatch.find_raw(pixels, width, height, pixels, width, height, threshold=1.0)
+        assert result is not None
+        assert result.to_tuple() == (0, 0, 1.0)
+        
+        result = rustmatch.find_raw(pixels, width, height, crop, 8, 8, threshold=1.0)
+        assert result is not None
+        assert result.to_tuple() == (*RAW_MATCH, 1.0)
+        
+        for match in rustmatch.find_all_raw(pixels, width, height, crop, 8, 8, threshold=0.0):
+            assert -1.0 <= match.confidence <= 1.0
+    
     def test_find_raw_dimension_mismatch(self):
         """Test error for mismatched dimensions."""
         with pytest.raises(ValueError):
@@ -197,6 +352,112 @@ class TestFindRaw:
                 [0] * 50, 10, 10,   # 50 pixels but 10x10=100, ERROR
                 threshold=0.5
             )
+    
+    def test_find_raw_template_too_large(self):
+        """Test error for templates beyond the supported pixel count."""
+        width, height = 4096, 2049  # just over 2^23 pixels
+        with pytest.raises(ValueError, match="too large"):
+            rustmatch.find_raw(
+                bytes(width * height), width, height,
+                bytes(width * height), width, height,
+                threshold=0.5
+            )
+
+
+class TestFindMany:
+    """Tests for searching several templates in one source."""
+    
+    def test_find_many_matches_find(self):
+        """Test that each result equals the single-template result."""
+        templates = [TEMPLATE_IMAGE, SOURCE_IMAGE]
+        results = rustmatch.find_many(SOURCE_IMAGE, templates)
+        
+        assert len(results) == 2
+        for template, result in zip(templates, results):
+            expected = rustmatch.find(SOURCE_IMAGE, template)
+            assert result.to_tuple() == expected.to_tuple()
+    
+    def test_find_all_many(self):
+        """Test that find_all_many returns one list per template."""
+        results = rustmatch.find_all_many(SOURCE_IMAGE, [TEMPLATE_IMAGE], threshold=0.8)
+        expected = rustmatch.find_all(SOURCE_IMAGE, TEMPLATE_IMAGE, threshold=0.8)
+        
+        assert [[r.to_tuple() for r in rs] for rs in results] == [[r.to_tuple() for r in expected]]
+    
+    def test_find_many_bytes(self):
+        """Test bytes variant against file path variant."""
+        with open(SOURCE_IMAGE, "rb") as f:
+            source_bytes = f.read()
+        with open(TEMPLATE_IMAGE, "rb") as f:
+            template_bytes = f.read()
+        
+        results = rustmatch.find_many_bytes(source_bytes, [template_bytes, template_bytes])
+        expected = rustmatch.find(SOURCE_IMAGE, TEMPLATE_IMAGE)
+        
+        assert [r.to_tuple() for r in results] == [expected.to_tuple()] * 2
+    
+    def test_find_many_raw(self):
+        """Test raw variant with (pixels, width, height) templates."""
+        width, height = RAW_WIDTH, RAW_HEIGHT
+        source_pixels, template_pixels = _raw_fixture()
+        
+        results = rustmatch.find_many_raw(
+            source_pixels, width, height, [(template_pixels, 8, 8)], threshold=0.5
+        )
+        expected = rustmatch.find_raw(source_pixels, width, height, template_pixels, 8, 8, threshold=0.5)
+        
+        assert (expected.x, expected.y) == RAW_MATCH
+        assert [r.to_tuple() for r in results] == [expected.to_tuple()]
+    
+    def test_find_many_empty(self):
+        """Test that no templates gives no results."""
+        assert rustmatch.find_many(SOURCE_IMAGE, []) == []
+    
+    def test_find_many_nonexistent_template(self):
+        """Test error handling for a missing template."""
+        with pytest.raises(OSError):
+            rustmatch.find_many(SOURCE_IMAGE, [TEMPLATE_IMAGE, "nonexistent.png"])
+
+
+class TestPreparedImage:
+    """Tests for searching already-decoded images."""
+    
+    def test_from_file(self):
+        """Test that the prepared image has the file's dimensions."""
+        image = rustmatch.PreparedImage.from_file(SOURCE_IMAGE)
+        
+        assert (image.width, image.height) == (1602, 364)
+    
+    def test_find_prepared_matches_find(self):
+        """Test that prepared images give the file path results."""
+        with open(TEMPLATE_IMAGE, "rb") as f:
+            template = rustmatch.PreparedImage.from_bytes(f.read())
+        source = rustmatch.PreparedImage.from_file(SOURCE_IMAGE)
+        
+        expected = rustmatch.find(SOURCE_IMAGE, TEMPLATE_IMAGE)
+        for _ in range(2):
+            assert rustmatch.find_prepared(source, template).to_tuple() == expected.to_tuple()
+        
+        expected_all = rustmatch.find_all(SOURCE_IMAGE, TEMPLATE_IMAGE, max_count=5)
+        results = rustmatch.find_all_prepared(source, template, max_count=5)
+        assert [r.to_tuple() for r in results] == [r.to_tuple() for r in expected_all]
+    
+    def test_from_raw(self):
+        """Test raw pixels against find_raw."""
+        width, height = RAW_WIDTH, RAW_HEIGHT
+        source_pixels, template_pixels = _raw_fixture()
+        
+        source = rustmatch.PreparedImage.from_raw(source_pixels, width, height)
+        template = rustmatch.PreparedImage.from_raw(template_pixels, 8, 8)
+        expected = rustmatch.find_raw(source_pixels, width, height, template_pixels, 8, 8, threshold=0.5)
+        
+        assert (expected.x, expected.y) == RAW_MATCH
+        assert rustmatch.find_prepared(source, template, threshold=0.5).to_tuple() == expected.to_tuple()
+    
+    def test_from_raw_dimension_mismatch(self):
+        """Test error for wrong pixel count."""
+        with pytest.raises(ValueError):
+            rustmatch.PreparedImage.from_raw(b"\x00" * 10, 4, 4)
 
 
 class TestUtilities:
@@ -219,6 +480,13 @@ class TestUtilities:
         assert width == 1602
         assert height == 364
     
+    def test_get_size_bytes_header_only(self):
+        """Test that only the image header is needed."""
+        with open(SOURCE_IMAGE, "rb") as f:
+            header = f.read(1024)
+        
+        assert rustmatch.get_size_bytes(header) == (1602, 364)
+    
     def test_version(self):
         """Test version function."""
         ver = rustmatch.version()
@@ -227,15 +495,65 @@ class TestUtilities:
         assert "." in ver  # Should be semver format
     
     def test_set_threads(self):
-        """Test setting thread count."""
-        # Note: set_threads can only be called once before any matching
-        # After that, the thread pool is already initialized
-        # This test just verifies the function exists and is callable
+        """Test that the thread count can be set repeatedly."""
         try:
             rustmatch.set_threads(4)
-        except ValueError as e:
-            # Expected if thread pool already initialized
-            assert "already been initialized" in str(e)
+            rustmatch.set_threads(4)
+            rustmatch.set_threads(1)
+        finally:
+            rustmatch.set_threads(0)
+    
+    def test_set_threads_after_match(self):
+        """Test that the pool can be resized between searches."""
+        first = rustmatch.find(SOURCE_IMAGE, TEMPLATE_IMAGE)
+        rustmatch.set_threads(2)
+        try:
+            second = rustmatch.find(SOURCE_IMAGE, TEMPLATE_IMAGE)
+        finally:
+            rustmatch.set_threads(0)
+        
+        assert (first.x, first.y) == (second.x, second.y)
+    
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="fork start method not available"
+    )
+    def test_find_after_fork(self):
+        """Test that a forked child can search with its own thread pool."""
+        expected = rustmatch.find(SOURCE_IMAGE, TEMPLATE_IMAGE)
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+        child = ctx.Process(target=_find_in_child, args=(results,))
+        child.start()
+        try:
+            result = results.get(timeout=60)
+        finally:
+            child.join(timeout=10)
+            if child.is_alive():
+                child.kill()
+        
+        assert result == expected.to_tuple()
+    
+    def test_clear_cache(self):
+        """Test that results don't change once the cache is cleared."""
+        first = rustmatch.find(SOURCE_IMAGE, TEMPLATE_IMAGE)
+        rustmatch.clear_cache()
+        second = rustmatch.find(SOURCE_IMAGE, TEMPLATE_IMAGE)
+        
+        assert (first.x, first.y) == (second.x, second.y)
+    
+    def test_cache_sees_rewritten_file(self, tmp_path):
+        """Test that a rewritten source file isn't served from the cache."""
+        source = tmp_path / "source.png"
+        with open(SOURCE_IMAGE, "rb") as f:
+            source.write_bytes(f.read())
+        assert rustmatch.find(str(source), TEMPLATE_IMAGE) is not None
+        
+        with open(TEMPLATE_IMAGE, "rb") as f:
+            source.write_bytes(f.read())
+        result = rustmatch.find(str(source), TEMPLATE_IMAGE)
+        
+        assert (result.x, result.y) == (0, 0)
 
 
 class TestConsistency: